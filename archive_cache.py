@@ -0,0 +1,109 @@
+import os
+import shutil
+import threading
+
+from config import ARCHIVE_CACHE_DIR, ARCHIVE_CACHE_MAX_BYTES
+from utils import sanitize_filename, evict_lru, remove_quietly
+from logger import get_logger
+
+_ARCHIVE_SUFFIX = ".archive"
+
+
+class ArchiveCache:
+    """
+    File IDをキーにした翻訳アーカイブのディスクキャッシュ。
+    アップローダーのFile IDは同じ内容を指し続けるため、キャッシュ済みなら再ダウンロードしない。
+    合計サイズがmax_bytesを超えたら最終利用が古いものから削除する。
+    """
+
+    def __init__(self, cache_dir=ARCHIVE_CACHE_DIR, max_bytes=ARCHIVE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.logger = get_logger("AutoJapanizer")
+        self._lock = threading.Lock()
+
+    def path_for(self, file_id):
+        return os.path.join(self.cache_dir, sanitize_filename(str(file_id)) + _ARCHIVE_SUFFIX)
+
+    def get(self, file_id):
+        """キャッシュ済みアーカイブのパスを返し、最終利用時刻を更新する（無ければNone）"""
+        path = self.path_for(file_id)
+        with self._lock:
+            try:
+                os.utime(path, None)
+            except OSError:
+                return None
+        return path
+
+    def contains(self, file_id):
+        return os.path.exists(self.path_for(file_id))
+
+    def store(self, file_id, archive_path):
+        """
+        アーカイブをキャッシュへ移動する（キャッシュ済みのパスを渡した場合は何もしない）。
+        上限を超える大きさのアーカイブはキャッシュせずに削除する。
+        戻り値: キャッシュに保存した場合True
+        """
+        path = self.path_for(file_id)
+        if os.path.abspath(archive_path) == os.path.abspath(path):
+            return True
+        if os.path.getsize(archive_path) > self.max_bytes:
+            os.remove(archive_path)
+            return False
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = path + ".tmp"
+            # 別ドライブの場合はコピーになるため、一時ファイル経由で置き換える
+            shutil.move(archive_path, tmp_path)
+            os.replace(tmp_path, path)
+            self._evict(keep=path)
+        return True
+
+    def remove(self, file_id):
+        with self._lock:
+            try:
+                os.remove(self.path_for(file_id))
+            except OSError:
+                pass
+
+    def clear(self):
+        """キャッシュをすべて削除する"""
+        with self._lock:
+            if not os.path.isdir(self.cache_dir):
+                return
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file():
+                    remove_quietly(entry.path)
+
+    def total_bytes(self):
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        return sum(entry.stat().st_size for entry in os.scandir(self.cache_dir)
+                   if entry.name.endswith(_ARCHIVE_SUFFIX))
+
+    def _evict(self, keep=None):
+        """合計サイズが上限を超えていれば最終利用の古い順に削除する（ロック取得済みで呼ぶ）"""
+        evict_lru(self.cache_dir, _ARCHIVE_SUFFIX, self.max_bytes, self._remove, keep=keep)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            # 展開中などで削除できないものは次回に回す
+            return False
+        self.logger.info(f"アーカイブキャッシュから削除: {os.path.basename(path)}")
+        return True
+
+
+_archive_cache = None
+_archive_cache_lock = threading.Lock()
+
+
+def get_archive_cache():
+    """プロセス全体で共有するアーカイブキャッシュ"""
+    global _archive_cache
+    if _archive_cache is None:
+        with _archive_cache_lock:
+            if _archive_cache is None:
+                _archive_cache = ArchiveCache()
+    return _archive_cache
@@ -1,17 +1,29 @@
 import os
-import csv
-import json
 import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from collections import defaultdict
 
-from config import MODS_DIR, LOCAL_MODS_DIR, LOGS_DIR, TMP_DIR, OLD_DIR, LANG_DIR_NAME, JP_DIR_NAME, CSV_FILENAME, CSV_ENCODING
-from utils import sanitize_filename, get_mod_name_from_xml, force_remove, find_japanese_dir, determine_placement_locations, copy_japanese_to_locations
-from downloader import download_zip, is_archive_file, extract_archive
+from config import LOGS_DIR, TMP_DIR, OLD_DIR, LANG_DIR_NAME, JP_DIR_NAME, CSV_FILENAME, STATUS_FILENAME, STATUS_JOURNAL_COMPACT_EVERY
+from config import APPLY_DOWNLOAD_WORKERS, APPLY_EXTRACT_WORKERS, APPLY_PLACE_WORKERS, MOD_SCAN_WORKERS
+from config import APPLY_ORDER, APPLY_BANDWIDTH_LIMIT
+from utils import force_remove, determine_placement_locations, copy_japanese_to_locations
+from downloader import download_zip, get_archive_type, extract_japanese_dir
+from archive_cache import get_archive_cache
+from download_scheduler import estimate_sizes, order_applicable, estimate_duration, format_bytes, format_duration
+from http_client import RateLimiter
 from translation_scraper import scrape_and_save_to_csv
+from catalog_db import open_catalog, file_signature
+from mod_inventory import scan_installed_mods
+from status_journal import StatusJournal
+from placement_fingerprint import fingerprint_placement, verify_placement
 from logger import get_logger
 
+# MOD ID → 最新翻訳のインデックス（カタログCSVのシグネチャが変わったときだけ再構築）
+_latest_index_cache = {'signature': None, 'index': {}}
+
 
 class AutoJapanizer:
     """一括日本語化機能を管理するクラス"""
@@ -19,120 +31,174 @@ class AutoJapanizer:
     def __init__(self, pman):
         self.pman = pman
         self.logger = get_logger("AutoJapanizer")
-        self.status_file = os.path.join(LOGS_DIR, "japanization_status.json")
+        self.status_file = os.path.join(LOGS_DIR, STATUS_FILENAME)
         self.csv_file = os.path.join(LOGS_DIR, CSV_FILENAME)
+        self._catalog = None
+        self._status_journal = None
+        
+    @property
+    def catalog(self):
+        """翻訳リスト・適用状況のSQLiteストア（初回アクセス時にCSV / JSONの変更を取り込む）"""
+        if self._catalog is None:
+            self._catalog = open_catalog()
+        return self._catalog
         
+    @property
+    def status_journal(self):
+        """適用状況のジャーナル（初回アクセス時に前回の残りをスナップショットへ反映）"""
+        if self._status_journal is None:
+            self._status_journal = StatusJournal()
+            if self._status_journal.load():
+                self.compact_japanization_status()
+        return self._status_journal
         
     def load_japanization_status(self):
-        """適用済みFile IDの状態を読み込む"""
-        if os.path.exists(self.status_file):
-            try:
-                with open(self.status_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                self.logger.warning("ステータスファイルの読み込みに失敗、新規作成します")
+        """適用済みFile IDの状態を読み込む（ジャーナルの未反映分を含む）"""
+        try:
+            journal = self.status_journal
+            status = self.catalog.get_status()
+            status.update(journal.pending())
+            return status
+        except Exception as e:
+            self.logger.warning(f"ステータスの読み込みに失敗、新規作成します: {e}")
         return {}
         
+    def record_japanization_status(self, mod_id, entry):
+        """1MOD分の適用状況をジャーナルに追記する（一定件数ごとにスナップショットへ反映）"""
+        try:
+            self.status_journal.append(mod_id, entry)
+            if self.status_journal.pending_count() >= STATUS_JOURNAL_COMPACT_EVERY:
+                self.compact_japanization_status()
+        except Exception as e:
+            self.logger.error(f"適用状況の記録に失敗: {e}")
+            
+    def compact_japanization_status(self):
+        """ジャーナルの内容をスナップショット（カタログDB・JSON）へ反映し、ジャーナルを空にする"""
+        try:
+            count = self.status_journal.compact(self.catalog.update_status)
+            if count:
+                self.logger.info(f"適用ジャーナルをスナップショットへ反映しました: {count}件")
+        except Exception as e:
+            self.logger.error(f"適用ジャーナルの反映に失敗: {e}")
+        
     def save_japanization_status(self, status):
         """適用済みFile IDの状態を保存する"""
         try:
-            with open(self.status_file, 'w', encoding='utf-8') as f:
-                json.dump(status, f, ensure_ascii=False, indent=2)
+            self.catalog.replace_status(status)
         except Exception as e:
             self.logger.error(f"ステータスファイルの保存に失敗: {e}")
             
-    def load_translation_list(self):
-        """翻訳リストCSVを読み込む"""
-        if not os.path.exists(self.csv_file):
+    def load_latest_translation_index(self):
+        """
+        MOD IDごとの最新翻訳（JP-File-Upload-Date順）のインデックスを取得する。
+        カタログ（CSV）のmtime・サイズが前回から変わっていなければ構築済みのものを再利用する。
+        """
+        signature = file_signature(self.csv_file)
+        if signature is None:
             self.logger.error(f"翻訳リストファイルが見つかりません: {self.csv_file}")
-            return []
+            return {}
+        if _latest_index_cache['signature'] == signature:
+            return _latest_index_cache['index']
             
-        translations = []
         try:
-            with open(self.csv_file, 'r', encoding=CSV_ENCODING) as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    translations.append({
-                        'file_id': row['File ID'],
-                        'mod_id': row['MOD ID'],
-                        'mod_name': row['MOD Name'],
-                        'jp_upload_date': row['JP-File-Upload-Date']
-                    })
+            self.catalog.sync_from_csv()
+            index = self.catalog.get_latest_translations()
         except Exception as e:
             self.logger.error(f"翻訳リストの読み込みに失敗: {e}")
-            return []
+            return {}
             
-        self.logger.info(f"翻訳リストを読み込みました: {len(translations)}件")
-        return translations
+        _latest_index_cache['signature'] = signature
+        _latest_index_cache['index'] = index
+        self.logger.info(f"最新翻訳インデックスを構築しました: {len(index)}MOD")
+        return index
         
     def get_installed_mods(self):
         """インストール済みMODの一覧を取得"""
         installed_mods = {}
         
-        for mod_type, mod_dir in [("Workshop", MODS_DIR), ("Local", LOCAL_MODS_DIR)]:
-            if not os.path.isdir(mod_dir):
-                continue
-                
-            for folder_name in os.listdir(mod_dir):
-                mod_path = os.path.join(mod_dir, folder_name)
-                if os.path.isdir(mod_path):
-                    sanitized_id = sanitize_filename(folder_name)
-                    display_name = get_mod_name_from_xml(mod_path) or folder_name
-                    
-                    installed_mods[sanitized_id] = {
-                        'mod_id': sanitized_id,
-                        'path': mod_path,
-                        'type': mod_type,
-                        'display_name': display_name,
-                        'original_folder': folder_name
-                    }
+        # 同じMOD IDがWorkshopとLocalの両方にある場合はLocal側で上書き（従来通り）
+        for mod in scan_installed_mods(self.logger):
+            installed_mods[mod['mod_id']] = mod
                     
         self.logger.info(f"インストール済みMOD: {len(installed_mods)}件")
         return installed_mods
         
-    def find_applicable_translations(self, installed_mods, translations):
-        """適用可能な翻訳を検索（CSVの上位を優先）"""
+    def find_applicable_translations(self, installed_mods, latest_index=None):
+        """適用可能な翻訳を検索（MODごとにアップロード日時が最新の翻訳を使用）"""
+        if latest_index is None:
+            latest_index = self.load_latest_translation_index()
         applicable = []
         status = self.load_japanization_status()
-        processed_mod_ids = set()  # 既に処理したMOD IDを記録
+        drifted = self.reconcile_applied_translations(installed_mods, status)
         
-        for translation in translations:
-            mod_id = translation['mod_id']
-            file_id = translation['file_id']
-            
-            # MODがインストールされているかチェック
-            if mod_id not in installed_mods:
-                continue
-                
-            # 同じMOD IDが既に処理済みの場合はスキップ（CSVの上位を優先）
-            if mod_id in processed_mod_ids:
-                self.logger.info(f"MOD {mod_id} は既に新しい翻訳が検出済み、古い翻訳をスキップ (File ID: {file_id})")
+        for mod_id, mod_info in installed_mods.items():
+            translation = latest_index.get(mod_id)
+            if translation is None:
                 continue
+            file_id = translation['file_id']
                 
             # 既に適用済みかチェック
             mod_status = status.get(mod_id, {})
-            if mod_status.get('applied_file_id') == file_id:
+            if mod_status.get('applied_file_id') == file_id and mod_id in drifted:
+                self.logger.info(f"MOD {mod_id} の日本語化が失われているため再適用します (File ID: {file_id})")
+            elif mod_status.get('applied_file_id') == file_id:
                 self.logger.info(f"MOD {mod_id} は既に最新の翻訳が適用済み (File ID: {file_id})")
-                processed_mod_ids.add(mod_id)  # 適用済みでも記録して重複を防ぐ
                 continue
                 
             # 新しい翻訳として追加
             applicable.append({
                 'translation': translation,
-                'mod_info': installed_mods[mod_id]
+                'mod_info': mod_info
             })
-            processed_mod_ids.add(mod_id)  # 処理済みとして記録
             
         self.logger.info(f"適用可能な翻訳: {len(applicable)}件")
         return applicable
         
+    def reconcile_applied_translations(self, installed_mods, status=None):
+        """
+        適用済みのMODについて、配置したJapaneseフォルダが残っているかを確認する。
+        Workshopの更新でMODフォルダが置き換えられると、適用状況は残ったまま日本語化だけが消える。
+        適用時に保存した指紋をstatレベルで比べ、一致しないものだけ内容を確認する。
+        内容が同じでmtimeだけ変わっていた場合は指紋を更新する。
+        戻り値: 日本語化が失われた（再適用が必要な）MOD IDの集合
+        """
+        if status is None:
+            status = self.load_japanization_status()
+        targets = [(mod_id, mod_info, status[mod_id]) for mod_id, mod_info in installed_mods.items()
+                   if status.get(mod_id, {}).get('applied_file_id')]
+        if not targets:
+            return set()
+        
+        def check(target):
+            mod_id, mod_info, entry = target
+            placement = entry.get('placement')
+            if placement is None:
+                # 指紋の無い古い適用状況は、Japaneseフォルダの有無だけ確認する
+                locations = determine_placement_locations(mod_info['path'])
+                exists = any(os.path.isdir(os.path.join(location, JP_DIR_NAME)) for location in locations)
+                return ("ok" if exists else "drifted"), None
+            return verify_placement(mod_info['path'], placement)
+        
+        drifted = set()
+        refreshed = 0
+        with ThreadPoolExecutor(max_workers=MOD_SCAN_WORKERS) as executor:
+            for (mod_id, _, entry), (state, placement) in zip(targets, executor.map(check, targets)):
+                if state == "drifted":
+                    drifted.add(mod_id)
+                elif state == "refreshed":
+                    self.record_japanization_status(mod_id, dict(entry, placement=placement))
+                    refreshed += 1
+        
+        self.logger.info(f"適用済みMODの確認: {len(targets)}件 (日本語化の消失: {len(drifted)}件, 指紋の更新: {refreshed}件)")
+        return drifted
+        
             
     def _analyze_existing_csv(self):
         """既存のCSVファイルを分析して適用可能な翻訳をチェック"""
         try:
-            # 既存の翻訳リストを読み込み
-            translations = self.load_translation_list()
-            if not translations:
+            # 既存の翻訳リストのインデックスを取得
+            latest_index = self.load_latest_translation_index()
+            if not latest_index:
                 self.pman.popup_error("翻訳リストの読み込みに失敗しました。")
                 return
                 
@@ -143,7 +209,7 @@ class AutoJapanizer:
                 return
                 
             # 適用可能な翻訳検索
-            applicable = self.find_applicable_translations(installed_mods, translations)
+            applicable = self.find_applicable_translations(installed_mods, latest_index)
             
             if applicable:
                 message = f"適用可能な日本語化ファイルが見つかりました！\n\n"
@@ -174,97 +240,242 @@ class AutoJapanizer:
             self.pman.set_status("翻訳リスト確認失敗")
             self.pman.popup_error(f"翻訳リストの確認中にエラーが発生しました。\n{e}")
         
-    def apply_japanization(self, translation_info):
-        """個別のMODに日本語化を適用"""
+    def _download_stage(self, translation_info, limiter=None):
+        """
+        ステージ1: アーカイブをダウンロードして検証する。
+        アーカイブキャッシュにあればダウンロードせずにそれを使う。
+        戻り値: {'path', 'archive_type', ...}（失敗時None）
+        """
         translation = translation_info['translation']
-        mod_info = translation_info['mod_info']
+        mod_id = translation['mod_id']
+        file_id = translation['file_id']
+        
+        cached = self._get_cached_archive(file_id)
+        if cached:
+            self.logger.info(f"キャッシュ済みのアーカイブを使用: {file_id}")
+            return cached
+        
+        # ダウンロードURL構築
+        download_url = f"https://rimworld.2game.info/jp_download.php?file_id={file_id}&id={mod_id}"
+        
+        # 一時ディレクトリ準備
+        os.makedirs(TMP_DIR, exist_ok=True)
+        os.makedirs(OLD_DIR, exist_ok=True)
+        
+        # ZIPファイルダウンロード
+        zip_path = os.path.join(TMP_DIR, f"{file_id}_download.zip")
+        archive = download_zip(download_url, file_id, zip_path, self.pman, limiter)
+        
+        # アーカイブファイル検証（形式はダウンロード中に先頭バイトから判定済み）
+        if not archive['archive_type']:
+            self.logger.error(f"ダウンロードファイルがアーカイブ形式ではありません: {file_id}")
+            os.remove(zip_path)
+            return None
+        self.logger.info(f"ダウンロード完了: {file_id} ({archive['size']}バイト)")
+        return archive
+        
+    def _get_cached_archive(self, file_id):
+        """キャッシュ済みのアーカイブ {'path', 'archive_type'}（無い・壊れている場合はNone）"""
+        archive_cache = get_archive_cache()
         
+        # 以前のバージョンがOLD_DIRに残したアーカイブはキャッシュへ移す
+        legacy_path = os.path.join(OLD_DIR, f"{file_id}_download.zip")
+        if os.path.exists(legacy_path):
+            try:
+                archive_cache.store(file_id, legacy_path)
+            except OSError as e:
+                self.logger.warning(f"旧アーカイブのキャッシュへの移動に失敗: {legacy_path} - {e}")
+        
+        cached_path = archive_cache.get(file_id)
+        if not cached_path:
+            return None
+        archive_type = get_archive_type(cached_path)
+        if not archive_type:
+            self.logger.warning(f"キャッシュ済みのアーカイブが壊れているため再ダウンロードします: {file_id}")
+            archive_cache.remove(file_id)
+            return None
+        return {'path': cached_path, 'archive_type': archive_type}
+        
+    def _extract_stage(self, translation_info, archive):
+        """ステージ2: アーカイブからJapaneseフォルダだけを展開する。戻り値: (展開先, Japaneseフォルダ)（失敗時None）"""
+        file_id = translation_info['translation']['file_id']
+        
+        # アーカイブのメンバー一覧からJapaneseフォルダを特定し、その配下のみ展開
+        unpack_dir = os.path.join(TMP_DIR, f"{file_id}_unpack")
+        if os.path.exists(unpack_dir):
+            shutil.rmtree(unpack_dir, onerror=force_remove)
+        jp_dir = extract_japanese_dir(archive['path'], unpack_dir, self.pman, archive['archive_type'])
+        if not jp_dir:
+            self.logger.error(f"Japaneseフォルダが見つかりません: {file_id}")
+            return None
+        return unpack_dir, jp_dir
+        
+    def _place_stage(self, translation_info, archive, unpack_dir, jp_dir):
+        """ステージ3: MODフォルダへ配置し、適用状況を記録して後片付けする"""
+        translation = translation_info['translation']
+        mod_info = translation_info['mod_info']
         mod_id = translation['mod_id']
         file_id = translation['file_id']
         mod_name = translation['mod_name']
         
-        self.logger.info(f"日本語化適用開始: {mod_name} (MOD ID: {mod_id}, File ID: {file_id})")
-        self.pman.set_progress(f"適用中: {mod_name} (File ID: {file_id})")
+        # 適切な配置場所を決定
+        mod_path = mod_info['path']
+        placement_locations = determine_placement_locations(mod_path)
         
-        try:
-            # ダウンロードURL構築
-            download_url = f"https://rimworld.2game.info/jp_download.php?file_id={file_id}&id={mod_id}"
-            
-            # 一時ディレクトリ準備
-            os.makedirs(TMP_DIR, exist_ok=True)
-            os.makedirs(OLD_DIR, exist_ok=True)
-            
-            # ZIPファイルダウンロード
-            zip_path = os.path.join(TMP_DIR, f"{file_id}_download.zip")
-            download_zip(download_url, file_id, zip_path, self.pman)
-            
-            # アーカイブファイル検証
-            if not is_archive_file(zip_path):
-                self.logger.error(f"ダウンロードファイルがアーカイブ形式ではありません: {file_id}")
-                return False
-                
-            # アーカイブ展開
-            unpack_dir = os.path.join(TMP_DIR, f"{file_id}_unpack")
-            if os.path.exists(unpack_dir):
-                shutil.rmtree(unpack_dir, onerror=force_remove)
-            extract_archive(zip_path, unpack_dir, self.pman)
-            
-            # Japaneseフォルダ検索
-            jp_dir = find_japanese_dir(unpack_dir)
-            if not jp_dir:
-                self.logger.error(f"Japaneseフォルダが見つかりません: {file_id}")
-                return False
-                
-            # 適切な配置場所を決定
-            mod_path = mod_info['path']
-            placement_locations = determine_placement_locations(mod_path)
-            
-            if not placement_locations:
-                self.logger.error(f"適切な配置場所が見つかりません: {mod_path}")
-                return False
-            
-            # 既存のJapaneseフォルダをバックアップ（最初の配置場所のみ）
-            first_dest = os.path.join(placement_locations[0], JP_DIR_NAME)
-            if os.path.exists(first_dest):
-                backup_dir = os.path.join(OLD_DIR, f"{mod_id}_old_japanese")
-                if os.path.exists(backup_dir):
-                    shutil.rmtree(backup_dir, onerror=force_remove)
-                shutil.move(first_dest, backup_dir)
-                self.logger.info(f"既存のJapaneseフォルダをバックアップ: {backup_dir}")
-            
-            # 複数箇所にJapaneseフォルダをコピー
-            success_count, total_count = copy_japanese_to_locations(jp_dir, placement_locations, self.logger)
-            
-            if success_count == 0:
-                self.logger.error(f"Japaneseフォルダのコピーに失敗: {mod_path}")
-                return False
-            elif success_count < total_count:
-                self.logger.warning(f"Japaneseフォルダを{success_count}/{total_count}箇所にコピー: {mod_path}")
-            else:
-                self.logger.info(f"Japaneseフォルダを{total_count}箇所にコピー完了: {mod_path}")
-            
-            # ステータス更新
-            status = self.load_japanization_status()
-            status[mod_id] = {
-                'applied_file_id': file_id,
-                'applied_date': datetime.now().isoformat(),
-                'mod_name': mod_name,
-                'mod_type': mod_info['type']
-            }
-            self.save_japanization_status(status)
-            
-            # クリーンアップ
-            shutil.move(zip_path, os.path.join(OLD_DIR, os.path.basename(zip_path)))
-            shutil.rmtree(unpack_dir, onerror=force_remove)
-            
-            self.logger.info(f"日本語化適用完了: {mod_name}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"日本語化適用中にエラー: {e}")
+        if not placement_locations:
+            self.logger.error(f"適切な配置場所が見つかりません: {mod_path}")
             return False
+        
+        # 既存のJapaneseフォルダをバックアップ（最初の配置場所のみ）
+        first_dest = os.path.join(placement_locations[0], JP_DIR_NAME)
+        if os.path.exists(first_dest):
+            backup_dir = os.path.join(OLD_DIR, f"{mod_id}_old_japanese")
+            if os.path.exists(backup_dir):
+                shutil.rmtree(backup_dir, onerror=force_remove)
+            shutil.move(first_dest, backup_dir)
+            self.logger.info(f"既存のJapaneseフォルダをバックアップ: {backup_dir}")
+        
+        # 複数箇所にJapaneseフォルダをコピー
+        success_count, total_count, strategies = copy_japanese_to_locations(jp_dir, placement_locations, self.logger)
+        
+        if success_count == 0:
+            self.logger.error(f"Japaneseフォルダのコピーに失敗: {mod_path}")
+            return False
+        elif success_count < total_count:
+            self.logger.warning(f"Japaneseフォルダを{success_count}/{total_count}箇所にコピー: {mod_path}")
+        else:
+            self.logger.info(f"Japaneseフォルダを{total_count}箇所にコピー完了 ({'/'.join(strategies)}): {mod_path}")
+        
+        # ステータス更新（ジャーナルに追記）。配置したJapaneseフォルダの指紋も記録する
+        entry = {
+            'applied_file_id': file_id,
+            'applied_date': datetime.now().isoformat(),
+            'mod_name': mod_name,
+            'mod_type': mod_info['type']
+        }
+        try:
+            entry['placement'] = fingerprint_placement(mod_path, placement_locations)
+        except OSError as e:
+            self.logger.warning(f"配置したJapaneseフォルダの指紋の作成に失敗: {mod_path} - {e}")
+        self.record_japanization_status(mod_id, entry)
+        
+        # クリーンアップ
+        try:
+            get_archive_cache().store(file_id, archive['path'])
+        except OSError as e:
+            self.logger.warning(f"アーカイブのキャッシュへの保存に失敗: {file_id} - {e}")
+        shutil.rmtree(unpack_dir, onerror=force_remove)
+        
+        self.logger.info(f"日本語化適用完了: {mod_name}")
+        return True
+        
+    def apply_japanization_batch(self, applicable, order=APPLY_ORDER, bandwidth_limit=APPLY_BANDWIDTH_LIMIT):
+        """
+        複数MODの日本語化をパイプラインで適用する。
+        ダウンロード・展開・配置をそれぞれ別のスレッドプールで実行し、
+        あるMODを展開している間に次のMODをダウンロードする。
+        配置はMOD IDごとに直列化する。
+        処理順は翻訳リストのSize列から見積もったダウンロード量で決め（order）、
+        開始前に総量と所要時間の目安を表示する。bandwidth_limit（バイト/秒）で全体の帯域を制限できる。
+        戻り値: (成功件数, 失敗件数)
+        """
+        total = len(applicable)
+        if not total:
+            return 0, 0
+        
+        estimates = estimate_sizes(applicable, get_archive_cache().contains)
+        applicable = order_applicable(applicable, estimates, order)
+        total_bytes = sum(estimates.values())
+        plan_info = f"{total}件, ダウンロード約{format_bytes(total_bytes)}, 予想所要時間 約{format_duration(estimate_duration(total_bytes, bandwidth_limit))}"
+        self.logger.info(f"一括適用の計画: {plan_info} (処理順: {order}, 帯域上限: {format_bytes(bandwidth_limit) + '/秒' if bandwidth_limit else 'なし'})")
+        self.pman.set_status(f"日本語化適用中... ({plan_info})")
+        limiter = RateLimiter(bandwidth_limit) if bandwidth_limit else None
+        started_at = time.monotonic()
+        
+        download_pool = ThreadPoolExecutor(max_workers=APPLY_DOWNLOAD_WORKERS, thread_name_prefix="jp-download")
+        extract_pool = ThreadPoolExecutor(max_workers=APPLY_EXTRACT_WORKERS, thread_name_prefix="jp-extract")
+        place_pool = ThreadPoolExecutor(max_workers=APPLY_PLACE_WORKERS, thread_name_prefix="jp-place")
+        mod_locks = defaultdict(threading.Lock)
+        state_lock = threading.Lock()
+        all_done = threading.Event()
+        counts = {'success': 0, 'failed': 0, 'downloaded_bytes': 0}
+        
+        def finish(translation_info, ok, error=None):
+            # 進捗表示やログで例外が出ても、件数の集計と完了通知は必ず行う
+            with state_lock:
+                counts['success' if ok else 'failed'] += 1
+                done = counts['success'] + counts['failed']
+                try:
+                    mod_name = translation_info['mod_info']['display_name']
+                    if error is not None:
+                        self.logger.error(f"日本語化適用中にエラー: {mod_name} - {error}")
+                    self.pman.set_progress(f"({done}/{total}) {mod_name} {'適用完了' if ok else '適用失敗'}{remaining_info()}")
+                finally:
+                    if done == total:
+                        all_done.set()
+        
+        def remaining_info():
+            # 実測のダウンロード速度から残りの所要時間を見積もる（state_lock取得済みで呼ぶ）
+            downloaded = counts['downloaded_bytes']
+            elapsed = time.monotonic() - started_at
+            if not downloaded or downloaded >= total_bytes or elapsed <= 0:
+                return ""
+            return f" - 残り約{format_duration((total_bytes - downloaded) * elapsed / downloaded)}"
+        
+        def place(translation_info, archive, extracted):
+            with mod_locks[translation_info['translation']['mod_id']]:
+                return self._place_stage(translation_info, archive, *extracted)
+        
+        def on_placed(translation_info, future):
+            try:
+                ok, error = future.result(), None
+            except Exception as e:
+                ok, error = False, e
+            finish(translation_info, ok, error)
+        
+        def on_extracted(translation_info, archive, future):
+            # finishは必ず1回だけ呼ぶ（finish自体の例外で二重に数えない）
+            try:
+                extracted = future.result()
+                if extracted:
+                    place_pool.submit(place, translation_info, archive, extracted).add_done_callback(
+                        lambda f: on_placed(translation_info, f))
+                    return
+                error = None
+            except Exception as e:
+                error = e
+            finish(translation_info, False, error)
+        
+        def on_downloaded(translation_info, future):
+            try:
+                with state_lock:
+                    counts['downloaded_bytes'] += estimates[translation_info['translation']['file_id']]
+                archive = future.result()
+                if archive:
+                    extract_pool.submit(self._extract_stage, translation_info, archive).add_done_callback(
+                        lambda f: on_extracted(translation_info, archive, f))
+                    return
+                error = None
+            except Exception as e:
+                error = e
+            finish(translation_info, False, error)
+        
+        try:
+            for translation_info in applicable:
+                translation = translation_info['translation']
+                self.logger.info(f"日本語化適用開始: {translation['mod_name']} (MOD ID: {translation['mod_id']}, File ID: {translation['file_id']})")
+                download_pool.submit(self._download_stage, translation_info, limiter).add_done_callback(
+                    lambda f, info=translation_info: on_downloaded(info, f))
+            all_done.wait()
+        finally:
+            download_pool.shutdown(wait=True)
+            extract_pool.shutdown(wait=True)
+            place_pool.shutdown(wait=True)
+        
+        self.logger.info(f"一括適用の所要時間: {format_duration(time.monotonic() - started_at)}")
+        return counts['success'], counts['failed']
             
-    def run_auto_japanization(self):
+    def run_auto_japanization(self, order=APPLY_ORDER, bandwidth_limit=APPLY_BANDWIDTH_LIMIT):
         """一括日本語化処理を実行"""
         try:
             self.logger.info("=== 一括日本語化処理開始 ===")
@@ -272,8 +483,8 @@ class AutoJapanizer:
             
             # 翻訳リスト読み込み
             self.pman.set_status("翻訳リスト読み込み中...")
-            translations = self.load_translation_list()
-            if not translations:
+            latest_index = self.load_latest_translation_index()
+            if not latest_index:
                 self.pman.popup_error("翻訳リストが見つからないか、読み込みに失敗しました。\n先にmod_list_getter.pyを実行してください。")
                 return
                 
@@ -286,25 +497,15 @@ class AutoJapanizer:
                 
             # 適用可能な翻訳検索
             self.pman.set_status("適用可能な翻訳検索中...")
-            applicable = self.find_applicable_translations(installed_mods, translations)
+            applicable = self.find_applicable_translations(installed_mods, latest_index)
             
             if not applicable:
                 self.pman.popup_info("適用可能な新しい翻訳はありませんでした。")
                 return
                 
-            # 一括適用実行
+            # 一括適用実行（ダウンロード・展開・配置のパイプライン）
             self.pman.set_status(f"日本語化適用中... ({len(applicable)}件)")
-            success_count = 0
-            failed_count = 0
-            
-            for i, translation_info in enumerate(applicable):
-                mod_name = translation_info['mod_info']['display_name']
-                self.pman.set_progress(f"({i+1}/{len(applicable)}) {mod_name} 適用中...")
-                
-                if self.apply_japanization(translation_info):
-                    success_count += 1
-                else:
-                    failed_count += 1
+            success_count, failed_count = self.apply_japanization_batch(applicable, order, bandwidth_limit)
                     
             # 結果報告
             result_message = f"一括日本語化処理完了！\n\n成功: {success_count}件\n失敗: {failed_count}件"
@@ -321,12 +522,13 @@ class AutoJapanizer:
             self.pman.set_status("一括日本語化処理失敗")
             self.pman.popup_error(f"一括日本語化処理中にエラーが発生しました。\n{e}")
         finally:
+            self.compact_japanization_status()
             self.logger.info("=== 一括日本語化処理終了 ===")
 
 
-def run_auto_japanization(pman):
+def run_auto_japanization(pman, order=APPLY_ORDER, bandwidth_limit=APPLY_BANDWIDTH_LIMIT):
     """一括日本語化処理のエントリーポイント"""
     auto_jp = AutoJapanizer(pman)
-    auto_jp.run_auto_japanization()
+    auto_jp.run_auto_japanization(order, bandwidth_limit)
 
 
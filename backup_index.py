@@ -0,0 +1,142 @@
+import os
+import json
+from collections import defaultdict
+
+from config import BACKUP_ROOT, BACKUP_INDEX_FILENAME
+from fingerprint import HASH_ALGORITHM
+from utils import atomic_open
+
+_INDEX_VERSION = 2
+
+
+class BackupIndex:
+    """
+    バックアップ済みMODの指紋（ディレクトリハッシュ）の索引。
+    {バックアップフォルダ名: {"種別/MOD ID": 指紋}} をBACKUP_ROOT直下に保存し、
+    MOD IDごとの指紋の集合を引けるようにする。
+    索引に無いバックアップフォルダ（旧バージョンで作成・手動で追加）は、sync時に一度だけ走査して登録する。
+    """
+
+    def __init__(self, backup_root=BACKUP_ROOT):
+        self.backup_root = backup_root
+        self.path = os.path.join(backup_root, BACKUP_INDEX_FILENAME)
+        self._backups = {}
+        self._fingerprints = defaultdict(set)  # MOD ID -> 指紋の集合
+        self._locations = {}  # (MOD ID, 指紋) -> (最新のバックアップフォルダ名, 種別)
+        self._latest = defaultdict(dict)  # MOD ID -> {種別: 最新のバックアップフォルダ名}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # 指紋のアルゴリズムが変わった場合は全バックアップを登録し直す
+            if data.get('version') == _INDEX_VERSION and data.get('algorithm') == HASH_ALGORITHM:
+                self._backups = data['backups']
+        except (OSError, ValueError, KeyError, AttributeError):
+            self._backups = {}
+        self._rebuild_lookup()
+
+    def _rebuild_lookup(self):
+        self._fingerprints = defaultdict(set)
+        self._locations = {}
+        self._latest = defaultdict(dict)
+        # フォルダ名（backup_YYYYMMDD_HHMMSS）の古い順に登録し、新しいもので上書きする
+        for backup_name in sorted(self._backups):
+            for key, fingerprint in self._backups[backup_name].items():
+                self._register(backup_name, key, fingerprint)
+
+    def _register(self, backup_name, key, fingerprint):
+        mod_type, mod_id = key.split('/', 1)
+        self._fingerprints[mod_id].add(fingerprint)
+        self._locations[(mod_id, fingerprint)] = (backup_name, mod_type)
+        self._latest[mod_id][mod_type] = backup_name
+
+    def sync(self, fingerprint_func, exclude=(), logger=None, pman=None):
+        """
+        BACKUP_ROOTのバックアップフォルダ一覧と索引を突き合わせる。
+        消えたバックアップは索引から外し、索引に無いバックアップはfingerprint_func(MODフォルダ)で登録する。
+        戻り値: 索引に登録されているバックアップ数
+        """
+        backup_names = set()
+        if os.path.isdir(self.backup_root):
+            backup_names = {entry.name for entry in os.scandir(self.backup_root)
+                            if entry.is_dir() and entry.name.startswith("backup_") and entry.name not in exclude}
+
+        removed = [name for name in self._backups if name not in backup_names]
+        for name in removed:
+            del self._backups[name]
+        if removed:
+            self._dirty = True
+            if logger:
+                logger.info(f"削除されたバックアップを索引から外しました: {len(removed)}件")
+
+        missing = sorted(backup_names - set(self._backups))
+        for i, name in enumerate(missing):
+            if logger:
+                logger.info(f"索引に無いバックアップを登録中 ({i + 1}/{len(missing)}): {name}")
+            if pman:
+                pman.set_status(f"バックアップの索引を作成中 ({i + 1}/{len(missing)}): {name}")
+            self._backups[name] = self._scan_backup(os.path.join(self.backup_root, name), fingerprint_func)
+            self._dirty = True
+
+        if removed or missing:
+            self._rebuild_lookup()
+        return len(self._backups)
+
+    def _scan_backup(self, backup_dir, fingerprint_func):
+        mods = {}
+        for type_entry in os.scandir(backup_dir):
+            if not type_entry.is_dir():
+                continue
+            for mod_entry in os.scandir(type_entry.path):
+                if mod_entry.is_dir():
+                    mods[f"{type_entry.name}/{mod_entry.name}"] = fingerprint_func(mod_entry.path)
+        return mods
+
+    def has_mod(self, mod_id):
+        """過去のバックアップにこのMOD IDがあるか"""
+        return bool(self._fingerprints.get(mod_id))
+
+    def contains(self, mod_id, fingerprint):
+        """このMOD IDの同じ指紋のバックアップがあるか"""
+        return fingerprint in self._fingerprints.get(mod_id, ())
+
+    def locate(self, mod_id, fingerprint):
+        """このMOD IDの同じ指紋を持つ最新のバックアップ (バックアップフォルダ名, 種別)。無ければNone"""
+        return self._locations.get((mod_id, fingerprint))
+
+    def latest(self, mod_id, mod_type):
+        """
+        このMOD IDの最新のバックアップ (バックアップフォルダ名, 種別)。無ければNone。
+        同じ種別（Workshop/Local）のものを優先する。
+        """
+        by_type = self._latest.get(mod_id)
+        if not by_type:
+            return None
+        if mod_type in by_type:
+            return by_type[mod_type], mod_type
+        other_type, backup_name = max(by_type.items(), key=lambda item: item[1])
+        return backup_name, other_type
+
+    def mod_ids(self):
+        """過去のバックアップにあるMOD IDの集合"""
+        return {mod_id for mod_id, fingerprints in self._fingerprints.items() if fingerprints}
+
+    def add(self, backup_name, mod_type, mod_id, fingerprint):
+        """新しく作成したバックアップのMODを登録する"""
+        key = f"{mod_type}/{mod_id}"
+        self._backups.setdefault(backup_name, {})[key] = fingerprint
+        self._register(backup_name, key, fingerprint)
+        self._dirty = True
+
+    def save(self):
+        """変更があればアトミックに書き出す"""
+        if not self._dirty:
+            return False
+        os.makedirs(self.backup_root, exist_ok=True)
+        with atomic_open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'version': _INDEX_VERSION, 'algorithm': HASH_ALGORITHM, 'backups': self._backups}, f, ensure_ascii=False)
+        self._dirty = False
+        return True
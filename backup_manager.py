@@ -1,138 +1,192 @@
 import os
+import sys
+import time
+import errno
 import shutil
 import datetime
-import filecmp
+import threading
 from collections import defaultdict
-
-from config import MODS_DIR, LOCAL_MODS_DIR, BACKUP_ROOT, LOGS_DIR
-from utils import get_mod_name_from_xml, sanitize_filename
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (MODS_DIR, LOCAL_MODS_DIR, BACKUP_ROOT, LOGS_DIR, MOD_SCAN_WORKERS,
+                    BACKUP_HASH_WORKERS, BACKUP_COPY_WORKERS, BACKUP_IO_CONCURRENCY, BACKUP_COPY_BUFFER_SIZE)
+from mod_inventory import scan_installed_mods
+from backup_index import BackupIndex
+from fingerprint import fingerprint_tree, list_files
+from file_hash_cache import get_hash_cache, save_all as save_hash_caches, forget as forget_hash_cache
+from utils import LINK_UNSUPPORTED_ERRNOS
 from logger import get_logger
 
 
-# mod_comparator.pyの機能を統合
-def are_dirs_equal(dir1, dir2, logger=None, pman=None):
-    """2つのディレクトリの内容が同じか高速に比較する（ハッシュベース最適化版）"""
-    if not os.path.isdir(dir1) or not os.path.isdir(dir2):
-        return False
-    
-    try:
-        # ハッシュベースの高速比較
-        return _compare_dirs_with_hash(dir1, dir2, logger, pman)
-    except Exception as e:
-        # エラーが発生した場合は従来の方法で比較
-        return _detailed_dir_comparison(dir1, dir2)
-
-def _compare_dirs_with_hash(dir1, dir2, logger=None, pman=None):
-    """ハッシュベースの高速ディレクトリ比較"""
-    import hashlib
-    import time
-    
-    # ディレクトリのハッシュを計算
-    hash1 = _calculate_dir_hash(dir1, logger, pman)
-    hash2 = _calculate_dir_hash(dir2, logger, pman)
-    
-    return hash1 == hash2
-
-def _calculate_dir_hash(dir_path, logger=None, pman=None):
-    """ディレクトリ全体のハッシュを計算（ファイル内容も含む）"""
-    import hashlib
-    import os
-    import time
-    
-    hasher = hashlib.md5()
-    
-    # ファイルパスをソートして一意性を保つ
-    file_paths = []
-    for root, dirs, files in os.walk(dir_path):
-        for file in files:
-            file_path = os.path.join(root, file)
-            rel_path = os.path.relpath(file_path, dir_path)
-            file_paths.append(rel_path)
-    
-    file_paths.sort()
-    total_files = len(file_paths)
+def _calculate_dir_hash(dir_path, logger=None, pman=None, files=None):
+    """
+    ディレクトリ全体の指紋を計算（ファイルの相対パス・サイズ・内容全体から決まり、mtimeは含めない）。
+    ファイルごとのハッシュは (パス, サイズ, mtime_ns) をキーに永続キャッシュし、
+    前回から変わっていないファイルは読み直さない（バックアップ内のファイルは一度だけ読む）。
+    files: 走査済みのファイル一覧（list_filesの結果）
+    """
+    cache, prefix = get_hash_cache(dir_path)
     start_time = time.time()
     
-    if logger and total_files > 100:  # 100ファイル以上の場合のみ進捗表示
-        logger.info(f"      -> ハッシュ計算進捗: 0/{total_files:,}ファイル (0.00%)")
-    
-    for i, rel_path in enumerate(file_paths):
-        full_path = os.path.join(dir_path, rel_path)
-        try:
-            # ファイルパスをハッシュに追加
-            hasher.update(rel_path.encode('utf-8'))
-            
-            # ファイルサイズをハッシュに追加
-            file_size = os.path.getsize(full_path)
-            hasher.update(str(file_size).encode('utf-8'))
-            
-            # ファイルの修正時間をハッシュに追加
-            mtime = os.path.getmtime(full_path)
-            hasher.update(str(mtime).encode('utf-8'))
-            
-            # 小さいファイル（1MB以下）は内容もハッシュに含める
-            if file_size <= 1024 * 1024:  # 1MB
-                with open(full_path, 'rb') as f:
-                    # ファイルの先頭と末尾の一部を読み取る（高速化）
-                    chunk_size = min(8192, file_size)
-                    if file_size > 0:
-                        f.seek(0)
-                        chunk = f.read(chunk_size)
-                        hasher.update(chunk)
-                        
-                        # ファイルが大きい場合は末尾も読み取る
-                        if file_size > chunk_size * 2:
-                            f.seek(-chunk_size, 2)
-                            chunk = f.read(chunk_size)
-                            hasher.update(chunk)
-            
-        except (OSError, IOError):
-            # ファイルが読めない場合はパスとサイズのみでハッシュ
-            hasher.update(rel_path.encode('utf-8'))
-            hasher.update(b'0')  # サイズ0として扱う
-        
+    def on_file(done, total_files, hashed):
         # 進捗表示（100ファイルごと、または最後のファイル）
-        if total_files > 100 and (i + 1) % 100 == 0 or i == total_files - 1:
+        if done == 1 and logger and total_files > 100:  # 100ファイル以上の場合のみ進捗表示
+            logger.info(f"      -> ハッシュ計算進捗: 0/{total_files:,}ファイル (0.00%)")
+        if total_files > 100 and done % 100 == 0 or done == total_files:
             elapsed = time.time() - start_time
-            progress = (i + 1) / total_files * 100
-            files_per_sec = (i + 1) / elapsed if elapsed > 0 else 0
+            progress = done / total_files * 100
+            files_per_sec = done / elapsed if elapsed > 0 else 0
             
             # ログに進捗を記録
             if logger:
-                logger.info(f"      -> ハッシュ計算進捗: {i+1:,}/{total_files:,}ファイル ({progress:.1f}%) - {files_per_sec:.1f}ファイル/秒")
+                logger.info(f"      -> ハッシュ計算進捗: {done:,}/{total_files:,}ファイル ({progress:.1f}%) - {files_per_sec:.1f}ファイル/秒")
             
             # GUIに進捗を表示
             if pman:
-                pman.set_status(f"ハッシュ計算中: {i+1:,}/{total_files:,}ファイル ({progress:.1f}%) - {files_per_sec:.1f}ファイル/秒")
+                pman.set_status(f"ハッシュ計算中: {done:,}/{total_files:,}ファイル ({progress:.1f}%) - {files_per_sec:.1f}ファイル/秒")
+    
+    fingerprint, new_entries, hashed_files, hashed_bytes = fingerprint_tree(dir_path, cache.get_tree(prefix), on_file, files)
+    cache.set_tree(prefix, new_entries)
     
     total_elapsed = time.time() - start_time
+    total_files = len(new_entries)
     if total_files > 0:
         files_per_sec = total_files / total_elapsed if total_elapsed > 0 else 0
         
         # ログに完了情報を記録
         if logger:
-            logger.info(f"      -> ハッシュ計算完了: {total_files:,}ファイル, {total_elapsed:,.2f}秒 ({files_per_sec:.1f}ファイル/秒)")
+            logger.info(f"      -> ハッシュ計算完了: {total_files:,}ファイル (読み込み: {hashed_files:,}ファイル/{hashed_bytes / 1024 / 1024:,.1f}MB, キャッシュ: {total_files - hashed_files:,}), {total_elapsed:,.2f}秒 ({files_per_sec:.1f}ファイル/秒)")
         
         # GUIに完了情報を表示
         if pman:
             pman.set_status(f"ハッシュ計算完了: {total_files:,}ファイル ({total_elapsed:,.2f}秒)")
     
-    return hasher.hexdigest()
+    return fingerprint
+
+def _seed_backup_hash_cache(source_dir, backup_dir, base_dir=None):
+    """
+    コピーしたバックアップのハッシュキャッシュを、コピー元のキャッシュから引き継ぐ。
+    コピー後もサイズとmtimeが同じファイルだけ引き継ぐため、次回以降バックアップを読み直さずに済む。
+    base_dir: ハードリンク元の前回のバックアップ（リンクしたファイルはこちらのキャッシュを引き継ぐ）
+    """
+    backup_cache, backup_prefix = get_hash_cache(backup_dir)
+    candidates = []
+    for dir_path in (source_dir, base_dir):
+        if dir_path:
+            cache, prefix = get_hash_cache(dir_path)
+            candidates.append(cache.get_tree(prefix))
+    if not any(candidates):
+        return 0
+    seeded = {}
+    for rel_path, size, mtime_ns in list_files(backup_dir):
+        for entries in candidates:
+            entry = entries.get(rel_path)
+            if entry and entry[0] == size and entry[1] == mtime_ns:
+                seeded[rel_path] = entry
+                break
+    backup_cache.set_tree(backup_prefix, seeded)
+    return len(seeded)
+
+# カーネル内でファイルをコピーするAPIが使えない場合のエラー
+_KERNEL_COPY_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF, errno.EPERM,
+    errno.EOPNOTSUPP, getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP),
+}
+
+
+def _kernel_copy(src_fd, dst_fd, size):
+    """
+    copy_file_range（使えなければsendfile）でユーザー空間を経由せずにコピーする。
+    どちらも使えなければFalse（その場合は何も書き込まれていない）。
+    """
+    for name in ('copy_file_range', 'sendfile'):
+        func = getattr(os, name, None)
+        # sendfileでファイル同士をコピーできるのはLinuxのみ
+        if func is None or (name == 'sendfile' and not sys.platform.startswith('linux')):
+            continue
+        offset = 0
+        try:
+            while offset < size:
+                if name == 'copy_file_range':
+                    sent = func(src_fd, dst_fd, size - offset)
+                else:
+                    sent = func(dst_fd, src_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            return True
+        except OSError as e:
+            if offset or e.errno not in _KERNEL_COPY_UNSUPPORTED_ERRNOS:
+                raise
+            os.lseek(src_fd, 0, os.SEEK_SET)
+    return False
+
+
+def _copy_file(src, dst):
+    """バックアップ用のコピー関数（copytreeのcopy_function）。メタデータ（mtime等）も引き継ぐ"""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        if not size or not _kernel_copy(fsrc.fileno(), fdst.fileno(), size):
+            shutil.copyfileobj(fsrc, fdst, BACKUP_COPY_BUFFER_SIZE)
+    shutil.copystat(src, dst)
+    return dst
+
+
+class _SnapshotCopier:
+    """
+    スナップショット作成用のコピー関数（copytreeのcopy_function、rsync --link-dest相当）。
+    前回のバックアップ（base_dir）に同じ内容のファイルがあればハードリンクし、無いファイルだけコピーする。
+    同じ内容かどうかはハッシュキャッシュの (サイズ, ハッシュ) で判断し、ファイルは読み直さない。
+    """
+
+    def __init__(self, source_dir, base_dir=None):
+        self.source_dir = source_dir
+        self.base_dir = base_dir
+        self.source_entries = {}
+        self.base_entries = {}
+        if base_dir:
+            source_cache, source_prefix = get_hash_cache(source_dir)
+            base_cache, base_prefix = get_hash_cache(base_dir)
+            self.source_entries = source_cache.get_tree(source_prefix)
+            self.base_entries = base_cache.get_tree(base_prefix)
+        self.linked_files = self.linked_bytes = 0
+        self.copied_files = self.copied_bytes = 0
+
+    def _find_base_file(self, src):
+        """srcと同じ内容の前回のバックアップのファイル（無ければNone）"""
+        rel_path = os.path.relpath(src, self.source_dir).replace(os.sep, '/')
+        source_entry = self.source_entries.get(rel_path)
+        base_entry = self.base_entries.get(rel_path)
+        if not source_entry or not base_entry or source_entry[0] != base_entry[0] or source_entry[2] != base_entry[2]:
+            return None
+        base_path = os.path.join(self.base_dir, *rel_path.split('/'))
+        try:
+            # どちらもハッシュ計算後に変わっていないこと
+            src_stat = os.stat(src)
+            base_stat = os.stat(base_path)
+        except OSError:
+            return None
+        if (src_stat.st_size, src_stat.st_mtime_ns) != tuple(source_entry[:2]) or \
+                (base_stat.st_size, base_stat.st_mtime_ns) != tuple(base_entry[:2]):
+            return None
+        return base_path
+
+    def __call__(self, src, dst):
+        base_path = self._find_base_file(src) if self.base_dir else None
+        if base_path:
+            try:
+                os.link(base_path, dst)
+                self.linked_files += 1
+                self.linked_bytes += os.path.getsize(dst)
+                return dst
+            except OSError as e:
+                if e.errno not in LINK_UNSUPPORTED_ERRNOS:
+                    raise
+        _copy_file(src, dst)
+        self.copied_files += 1
+        self.copied_bytes += os.path.getsize(dst)
+        return dst
 
-def _detailed_dir_comparison(dir1, dir2):
-    """詳細なディレクトリ比較（フォールバック用）"""
-    try:
-        dcmp = filecmp.dircmp(dir1, dir2)
-        if dcmp.diff_files or dcmp.left_only or dcmp.right_only:
-            return False
-        
-        for sub_dcmp in dcmp.subdirs.values():
-            if not _detailed_dir_comparison(sub_dcmp.left, sub_dcmp.right):
-                return False
-                
-        return True
-    except Exception:
-        return False
 
 class ModStatus:
     """MODの比較結果を表すステータス"""
@@ -140,119 +194,61 @@ class ModStatus:
     DUPLICATE = "DUPLICATE"
     NEEDS_BACKUP = "NEEDS_BACKUP"
 
-def compare_mod_versions(mod_info, historical_mods, copied_versions_by_id, logger, pman=None):
+def compare_mod_versions(mod_info, backup_index, copied_fingerprints_by_id, logger, pman=None, fingerprint=None):
     """
     MODを過去のバックアップと現在の実行ですでにコピーされたものと比較する.
+    現在のMODの指紋（ディレクトリハッシュ）を一度だけ計算し、索引の指紋の集合と照合する。
+    fingerprint: 計算済みの指紋（指紋計算ステージで計算したもの）
     
     Returns:
-        ModStatus: 比較結果のステータス
+        (ModStatus, 指紋): 比較結果のステータスと現在のMODの指紋
     """
-    import time
     current_path = mod_info['path']
     mod_id = mod_info['mod_id']
     
-    # ファイル数を事前にチェック
-    try:
-        file_count = sum(len(files) for root, dirs, files in os.walk(current_path))
-        logger.info(f"  -> MODファイル数: {file_count:,}個")
-        if pman:
-            pman.set_status(f"MOD比較中: {file_count:,}ファイル")
-    except Exception:
-        file_count = 0
+    if fingerprint is None:
+        start_time = time.time()
+        logger.info("  -> 指紋（ディレクトリハッシュ）を計算中...")
+        fingerprint = _calculate_dir_hash(current_path, logger, pman)
+        logger.info(f"  -> 指紋: {fingerprint} ({time.time() - start_time:,.2f}秒)")
+    else:
+        logger.info(f"  -> 指紋: {fingerprint}")
     
     # ステップ1: 過去のバックアップとの比較
-    logger.info("  -> ステップ1: 過去のバックアップとの比較を開始...")
-    if mod_id in historical_mods:
-        total_backups = len(historical_mods[mod_id])
-        for i, old_path in enumerate(historical_mods[mod_id]):
-            backup_name = os.path.basename(old_path)
-            logger.info(f"    -> 比較中 ({i+1:,}/{total_backups:,}): {backup_name}")
-            if pman:
-                pman.set_status(f"バックアップ比較中 ({i+1:,}/{total_backups:,}): {backup_name}")
-            start_time = time.time()
-            
-            # ハッシュ計算の進捗を表示
-            logger.info(f"    -> ハッシュ計算中...")
-            if pman:
-                pman.set_status(f"ハッシュ計算中 ({i+1:,}/{total_backups:,}): {backup_name}")
-            hash_start = time.time()
-            if are_dirs_equal(current_path, old_path, logger, pman):
-                hash_elapsed = time.time() - hash_start
-                total_elapsed = time.time() - start_time
-                logger.info(f"    -> 結果: 同一のバージョンを過去のバックアップで発見しました。({old_path})")
-                logger.info(f"    -> ハッシュ計算時間: {hash_elapsed:,.2f}秒, 総比較時間: {total_elapsed:,.2f}秒")
-                if pman:
-                    pman.set_status(f"同一バージョン発見: {backup_name} ({total_elapsed:,.2f}秒)")
-                return ModStatus.UNCHANGED
-            else:
-                hash_elapsed = time.time() - hash_start
-                total_elapsed = time.time() - start_time
-                logger.info(f"    -> 結果: 内容が異なります")
-                logger.info(f"    -> ハッシュ計算時間: {hash_elapsed:,.2f}秒, 総比較時間: {total_elapsed:,.2f}秒")
-        logger.info("    -> 結果: 過去のバックアップに同一バージョンはありませんでした。")
+    logger.info("  -> ステップ1: 過去のバックアップとの比較...")
+    if backup_index.contains(mod_id, fingerprint):
+        logger.info("    -> 結果: 同一のバージョンを過去のバックアップで発見しました。")
         if pman:
-            pman.set_status("過去のバックアップに同一バージョンなし")
+            pman.set_status("同一バージョン発見")
+        return ModStatus.UNCHANGED, fingerprint
+    elif backup_index.has_mod(mod_id):
+        logger.info("    -> 結果: 過去のバックアップに同一バージョンはありませんでした。")
     else:
         logger.info("    -> 結果: このMODの過去のバックアップはありません。")
-        if pman:
-            pman.set_status("過去のバックアップなし")
 
     # ステップ2: 今回の実行内での重複チェック
-    logger.info("  -> ステップ2: 今回の実行内での重複チェックを開始...")
-    if mod_id in copied_versions_by_id:
-        total_copied = len(copied_versions_by_id[mod_id])
-        for i, copied_path in enumerate(copied_versions_by_id[mod_id]):
-            copied_name = os.path.basename(copied_path)
-            logger.info(f"    -> 比較中 ({i+1:,}/{total_copied:,}): {copied_name}")
-            if pman:
-                pman.set_status(f"重複チェック中 ({i+1:,}/{total_copied:,}): {copied_name}")
-            start_time = time.time()
-            
-            # ハッシュ計算の進捗を表示
-            logger.info(f"    -> ハッシュ計算中...")
-            if pman:
-                pman.set_status(f"ハッシュ計算中 ({i+1:,}/{total_copied:,}): {copied_name}")
-            hash_start = time.time()
-            if are_dirs_equal(current_path, copied_path, logger, pman):
-                hash_elapsed = time.time() - hash_start
-                total_elapsed = time.time() - start_time
-                logger.info(f"    -> 結果: 同一内容のバージョンが今回の処理で既にバックアップ済みです。({copied_path})")
-                logger.info(f"    -> ハッシュ計算時間: {hash_elapsed:,.2f}秒, 総比較時間: {total_elapsed:,.2f}秒")
-                if pman:
-                    pman.set_status(f"重複発見: {copied_name} ({total_elapsed:,.2f}秒)")
-                return ModStatus.DUPLICATE
-            else:
-                hash_elapsed = time.time() - hash_start
-                total_elapsed = time.time() - start_time
-                logger.info(f"    -> 結果: 内容が異なります")
-                logger.info(f"    -> ハッシュ計算時間: {hash_elapsed:,.2f}秒, 総比較時間: {total_elapsed:,.2f}秒")
-        logger.info("    -> 結果: 今回バックアップ済みのバージョンとは内容が異なります。")
+    logger.info("  -> ステップ2: 今回の実行内での重複チェック...")
+    if fingerprint in copied_fingerprints_by_id.get(mod_id, ()):
+        logger.info("    -> 結果: 同一内容のバージョンが今回の処理で既にバックアップ済みです。")
         if pman:
-            pman.set_status("重複なし - バックアップ必要")
+            pman.set_status("重複発見")
+        return ModStatus.DUPLICATE, fingerprint
+    elif mod_id in copied_fingerprints_by_id:
+        logger.info("    -> 結果: 今回バックアップ済みのバージョンとは内容が異なります。")
     else:
         logger.info("    -> 結果: このMOD IDは今回の実行で初めて処理されます。")
-        if pman:
-            pman.set_status("初回処理 - バックアップ必要")
-
-    return ModStatus.NEEDS_BACKUP
-
-
+    if pman:
+        pman.set_status("バックアップ必要")
 
-
-def get_all_backups(backup_root):
-    """すべてのバックアップフォルダのパスを新しい順で返す"""
-    if not os.path.isdir(backup_root):
-        return []
-
-    backups = [d for d in os.listdir(backup_root) if
-               os.path.isdir(os.path.join(backup_root, d)) and d.startswith("backup_")]
-    backups.sort(reverse=True)
-
-    return [os.path.join(backup_root, b) for b in backups]
+    return ModStatus.NEEDS_BACKUP, fingerprint
 
 
 def backup_mods(pman):
-    """差分を考慮してMODをバックアップし、詳細なログを記録する。"""
+    """
+    MODをバックアップし、詳細なログを記録する。
+    新規・更新されたMODがあれば、全MODを含むスナップショット（backup_YYYYMMDD_HHMMSS）を作成する。
+    前回のバックアップと同じ内容のファイルはハードリンクし、変更されたファイルだけをコピーする。
+    """
     logger = get_logger("BackupManager")
 
     now_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -269,28 +265,20 @@ def backup_mods(pman):
         # 1. 現在のMOD情報を収集
         logger.info("--- フェーズ1: 現行MODのスキャン開始 ---")
         mods_by_id = defaultdict(list)
+        found_counts = defaultdict(int)
+        for mod in scan_installed_mods(logger):
+            if mod['original_folder'] != mod['mod_id']:
+                logger.info(f"フォルダ名をサニタイズしました: '{mod['original_folder']}' -> '{mod['mod_id']}'")
+
+            mods_by_id[mod['mod_id']].append({
+                "mod_id": mod['mod_id'],
+                "path": mod['path'],
+                "type": mod['type'],
+                "display_name": f"{mod['display_name']} ({mod['type']})"
+            })
+            found_counts[mod['type']] += 1
         for name, path in [("Workshop", MODS_DIR), ("Local", LOCAL_MODS_DIR)]:
-            logger.info(f"スキャン中: {path} ({name})")
-            if os.path.isdir(path):
-                found_mods_count = 0
-                for original_folder_name in os.listdir(path):
-                    mod_path = os.path.join(path, original_folder_name)
-                    if os.path.isdir(mod_path):
-                        sanitized_id = sanitize_filename(original_folder_name)
-                        if original_folder_name != sanitized_id:
-                            logger.info(f"フォルダ名をサニタイズしました: '{original_folder_name}' -> '{sanitized_id}'")
-
-                        display_name_base = get_mod_name_from_xml(mod_path) or original_folder_name
-                        display_name = f"{display_name_base} ({name})"
-
-                        mods_by_id[sanitized_id].append({
-                            "mod_id": sanitized_id,
-                            "path": mod_path,
-                            "type": name,
-                            "display_name": display_name
-                        })
-                        found_mods_count += 1
-                logger.info(f"  -> {found_mods_count} 個のMODフォルダを検出しました。")
+            logger.info(f"スキャン: {path} ({name}) -> {found_counts[name]} 個のMODフォルダを検出しました。")
 
         current_mods_list = []
         for mod_id, mods in mods_by_id.items():
@@ -302,63 +290,131 @@ def backup_mods(pman):
         logger.info(f"合計 {len(current_mods_list)} 個のMODをスキャン対象とします。")
         logger.info("--- フェーズ1: 現行MODのスキャン完了 ---")
 
-        # 2. 過去の全バックアップからMOD情報を収集
-        logger.info("--- フェーズ2: 過去バックアップのスキャン開始 ---")
-        all_backup_dirs = get_all_backups(BACKUP_ROOT)
-        all_backup_dirs = [d for d in all_backup_dirs if os.path.basename(d) != os.path.basename(new_backup_dir)]
-        logger.info(f"検出した過去のバックアップ数: {len(all_backup_dirs)}件")
-
-        historical_mods = defaultdict(list)
-        if all_backup_dirs:
-            for backup_dir in all_backup_dirs:
-                for type_name in os.listdir(backup_dir):
-                    type_path = os.path.join(backup_dir, type_name)
-                    if os.path.isdir(type_path):
-                        for mod_id_folder in os.listdir(type_path):
-                            historical_mods[mod_id_folder].append(os.path.join(type_path, mod_id_folder))
-        logger.info(f"過去のバックアップから {len(historical_mods)} 個のユニークなMOD IDの情報を収集しました。")
-        logger.info("--- フェーズ2: 過去バックアップのスキャン完了 ---")
+        # 2. 過去の全バックアップの指紋を索引から読み込む（索引に無いバックアップだけ走査する）
+        logger.info("--- フェーズ2: 過去バックアップの索引読み込み開始 ---")
+        backup_index = BackupIndex(BACKUP_ROOT)
+        backup_count = backup_index.sync(lambda path: _calculate_dir_hash(path, logger),
+                                         exclude={os.path.basename(new_backup_dir)}, logger=logger, pman=pman)
+        logger.info(f"索引に登録済みの過去のバックアップ数: {backup_count}件")
+        historical_mod_ids = backup_index.mod_ids()
+        logger.info(f"過去のバックアップから {len(historical_mod_ids)} 個のユニークなMOD IDの情報を収集しました。")
+        logger.info("--- フェーズ2: 過去バックアップの索引読み込み完了 ---")
 
         # 3. 比較とコピー処理
+        #   走査: ファイル一覧とサイズを並列に取得し、大きいMODから処理する
+        #   指紋計算: BACKUP_HASH_WORKERS並列で先行して計算する
+        #   比較: 指紋が揃ったMODから順に判断し、バックアップが必要ならコピーステージに渡す
+        #   コピー: BACKUP_COPY_WORKERS並列（指紋計算と合わせてBACKUP_IO_CONCURRENCYまで）
+        #   各バックアップは全MODのスナップショットとし、前回のバックアップと同じ内容のファイルはハードリンクする
         logger.info("--- フェーズ3: 比較とバックアップ実行開始 ---")
+        phase_start = time.time()
         total_mods = len(current_mods_list)
         new_mods_list, updated_mods_list = [], []
         unchanged_count, skipped_duplicate_count = 0, 0
-        copied_versions_by_id = defaultdict(list)
+        copied_fingerprints_by_id = defaultdict(set)
+        copy_totals = defaultdict(int)
+        io_slots = threading.BoundedSemaphore(BACKUP_IO_CONCURRENCY)
+
+        pman.set_status(f"MODフォルダを走査中… ({total_mods}個)")
+        with ThreadPoolExecutor(max_workers=MOD_SCAN_WORKERS) as executor:
+            listings = list(executor.map(lambda mod: list_files(mod['path']), current_mods_list))
+        jobs = [(mod_info, files, sum(size for _, size, _ in files))
+                for mod_info, files in zip(current_mods_list, listings)]
+        # sortedは安定なので、同じサイズのMODはスキャン順（Workshop→Local）を保つ
+        jobs.sort(key=lambda job: job[2], reverse=True)
+        logger.info(f"走査完了: {sum(len(files) for files in listings):,}ファイル, {sum(job[2] for job in jobs) / 1024 / 1024:,.1f}MB "
+                    f"(指紋計算: {BACKUP_HASH_WORKERS}並列, コピー: {BACKUP_COPY_WORKERS}並列, I/O上限: {BACKUP_IO_CONCURRENCY})")
+
+        def fingerprint_stage(mod_info, files):
+            with io_slots:
+                return _calculate_dir_hash(mod_info['path'], logger, files=files)
+
+        def base_dir_of(mod_id, location):
+            # 索引上の (バックアップフォルダ名, 種別) -> ハードリンク元のMODフォルダ
+            if not location:
+                return None
+            backup_name, base_type = location
+            base_dir = os.path.join(BACKUP_ROOT, backup_name, base_type, mod_id)
+            return base_dir if os.path.isdir(base_dir) else None
+
+        def copy_stage(source_dir, dest_dir, base_dir):
+            copier = _SnapshotCopier(source_dir, base_dir)
+            with io_slots:
+                os.makedirs(os.path.dirname(dest_dir), exist_ok=True)
+                shutil.copytree(source_dir, dest_dir, copy_function=copier)
+            _seed_backup_hash_cache(source_dir, dest_dir, base_dir)
+            logger.info(f"      スナップショット作成: {source_dir} -> {dest_dir} "
+                        f"(コピー: {copier.copied_files:,}ファイル, ハードリンク: {copier.linked_files:,}ファイル"
+                        f"{' / リンク元: ' + base_dir if base_dir else ''})")
+            return copier
+
+        hash_pool = ThreadPoolExecutor(max_workers=BACKUP_HASH_WORKERS, thread_name_prefix="backup-hash")
+        copy_pool = ThreadPoolExecutor(max_workers=BACKUP_COPY_WORKERS, thread_name_prefix="backup-copy")
+        try:
+            hash_futures = [hash_pool.submit(fingerprint_stage, mod_info, files) for mod_info, files, _ in jobs]
+            copy_jobs = []
+            # 変更のないMOD（変更があった場合のみスナップショットに含める）
+            link_jobs = []
 
-        for idx, mod_info in enumerate(current_mods_list):
-            mod_id, current_path, mod_type, display_name = mod_info.values()
+            for idx, ((mod_info, files, size), hash_future) in enumerate(zip(jobs, hash_futures)):
+                mod_id, current_path, mod_type, display_name = mod_info.values()
 
-            logger.info(f"==> 処理中 ({idx + 1}/{total_mods}): {display_name} [{mod_id}]")
-            pman.set_status(f"({idx + 1}/{total_mods}) 比較中: {display_name}")
+                logger.info(f"==> 処理中 ({idx + 1}/{total_mods}): {display_name} [{mod_id}] ({size / 1024 / 1024:,.1f}MB)")
+                pman.set_status(f"({idx + 1}/{total_mods}) 比較中: {display_name}")
 
-            status = compare_mod_versions(mod_info, historical_mods, copied_versions_by_id, logger, pman)
+                status, fingerprint = compare_mod_versions(mod_info, backup_index, copied_fingerprints_by_id, logger, pman,
+                                                           fingerprint=hash_future.result())
 
-            logger.info("  -> ステップ3: 最終判断")
-            if status == ModStatus.UNCHANGED:
-                unchanged_count += 1
-                logger.info("    -> 判断: 変更なし (過去のバックアップと同一)。スキップします。")
-            elif status == ModStatus.DUPLICATE:
-                skipped_duplicate_count += 1
-                logger.info("    -> 判断: 重複スキップ (今回の他バージョンと同一)。スキップします。")
-            elif status == ModStatus.NEEDS_BACKUP:
-                logger.info("    -> 判断: バックアップが必要です。コピー処理を開始します。")
+                logger.info("  -> ステップ3: 最終判断")
                 dest_dir = os.path.join(new_backup_dir, mod_type, mod_id)
-                os.makedirs(os.path.dirname(dest_dir), exist_ok=True)
-
-                shutil.copytree(current_path, dest_dir)
-                logger.info(f"      コピー完了: {current_path} -> {dest_dir}")
-
-                copied_versions_by_id[mod_id].append(current_path)
-
-                if mod_id in historical_mods:
+                if status == ModStatus.UNCHANGED:
+                    unchanged_count += 1
+                    logger.info("    -> 判断: 変更なし (過去のバックアップと同一)。スナップショットにはハードリンクで含めます。")
+                    link_jobs.append((mod_info, fingerprint, dest_dir, base_dir_of(mod_id, backup_index.locate(mod_id, fingerprint))))
+                elif status == ModStatus.DUPLICATE:
+                    skipped_duplicate_count += 1
+                    logger.info("    -> 判断: 重複スキップ (今回の他バージョンと同一)。スナップショットにはハードリンクで含めます。")
+                    link_jobs.append((mod_info, fingerprint, dest_dir, base_dir_of(mod_id, backup_index.latest(mod_id, mod_type))))
+                elif status == ModStatus.NEEDS_BACKUP:
+                    logger.info("    -> 判断: バックアップが必要です。コピー処理を予約します。")
+                    base_dir = base_dir_of(mod_id, backup_index.latest(mod_id, mod_type))
+                    # 同じ内容の重複をスキップできるよう、コピーの完了を待たずに登録する
+                    copied_fingerprints_by_id[mod_id].add(fingerprint)
+                    copy_jobs.append((mod_info, fingerprint, copy_pool.submit(copy_stage, current_path, dest_dir, base_dir)))
+
+                logger.info(f"==> {display_name} の判断完了。")
+
+            # 新規・更新があればスナップショットを作成するので、変更のないMODもハードリンクで含める
+            unchanged_jobs = []
+            if copy_jobs:
+                logger.info(f"変更のない {len(link_jobs)} 個のMODを前回のバックアップからハードリンクします。")
+                unchanged_jobs = [(mod_info, fingerprint, copy_pool.submit(copy_stage, mod_info['path'], dest_dir, base_dir))
+                                  for mod_info, fingerprint, dest_dir, base_dir in link_jobs]
+
+            # コピーの完了を待ち、索引に登録する
+            all_jobs = copy_jobs + unchanged_jobs
+            for idx, (mod_info, fingerprint, copy_future) in enumerate(all_jobs):
+                mod_id, current_path, mod_type, display_name = mod_info.values()
+                pman.set_status(f"スナップショット作成中… ({idx + 1}/{len(all_jobs)}) {display_name}")
+                copier = copy_future.result()
+                copy_totals['copied_files'] += copier.copied_files
+                copy_totals['copied_bytes'] += copier.copied_bytes
+                copy_totals['linked_files'] += copier.linked_files
+                copy_totals['linked_bytes'] += copier.linked_bytes
+                backup_index.add(os.path.basename(new_backup_dir), mod_type, mod_id, fingerprint)
+                if idx >= len(copy_jobs):
+                    continue
+
+                if mod_id in historical_mod_ids:
                     updated_mods_list.append(display_name)
-                    logger.info("    -> 分類: 更新")
+                    logger.info(f"    -> 分類: 更新 - {display_name}")
                 else:
                     new_mods_list.append(display_name)
-                    logger.info("    -> 分類: 新規")
-
-            logger.info(f"==> {display_name} の処理完了。")
+                    logger.info(f"    -> 分類: 新規 - {display_name}")
+        finally:
+            hash_pool.shutdown(wait=True, cancel_futures=True)
+            copy_pool.shutdown(wait=True, cancel_futures=True)
+        logger.info(f"フェーズ3の所要時間: {time.time() - phase_start:,.2f}秒")
 
         # 4. 結果報告と後処理
         logger.info("--- フェーズ4: 結果集計 ---")
@@ -366,12 +422,17 @@ def backup_mods(pman):
             pman.set_status("変更なし。バックアップは作成されませんでした。")
             logger.info("新規・更新されたMODはなかったため、バックアップフォルダを削除します。")
             shutil.rmtree(new_backup_dir)
+            forget_hash_cache(new_backup_dir)
             pman.popup_info("更新されたMODはありませんでした。\n新しいバックアップは作成されませんでした。")
         else:
             summary_lines = [f"バックアップが完了しました。\n", f"新規: {len(new_mods_list)}個",
                              f"更新: {len(updated_mods_list)}個", f"変更なし: {unchanged_count}個"]
             log_summary = f"バックアップ結果: 新規 {len(new_mods_list)}, 更新 {len(updated_mods_list)}, 変更なし {unchanged_count}, 重複スキップ {skipped_duplicate_count}"
             logger.info(log_summary)
+            copy_summary = (f"コピー: {copy_totals['copied_files']:,}ファイル ({copy_totals['copied_bytes'] / 1024 / 1024:,.1f}MB), "
+                            f"ハードリンク: {copy_totals['linked_files']:,}ファイル ({copy_totals['linked_bytes'] / 1024 / 1024:,.1f}MB)")
+            summary_lines.append(copy_summary)
+            logger.info(f"スナップショット: {new_backup_dir} - {copy_summary}")
 
             if new_mods_list:
                 summary_lines.extend(["\n--- 新規MODリスト ---", ", ".join(new_mods_list)])
@@ -382,14 +443,17 @@ def backup_mods(pman):
 
             pman.set_status("バックアップ完了！")
             pman.popup_info("\n".join(summary_lines))
+        backup_index.save()
         logger.info("--- フェーズ4: 結果集計完了 ---")
 
     except Exception as e:
         logger.exception(f"バックアップ中に予期しないエラーが発生しました。エラー: {e}")
         if os.path.exists(new_backup_dir):
             shutil.rmtree(new_backup_dir)
+            forget_hash_cache(new_backup_dir)
             logger.warning(f"エラー発生のため、不完全なバックアップフォルダを削除しました: {new_backup_dir}")
         pman.set_status("バックアップ失敗。")
         pman.popup_error(f"バックアップ中にエラーが発生しました。\n{e}")
     finally:
+        save_hash_caches(logger)
         logger.info("================ バックアップ処理終了 ================")
\ No newline at end of file
@@ -0,0 +1,243 @@
+import os
+import csv
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from config import LOGS_DIR, CSV_FILENAME, CSV_ENCODING, CATALOG_DB_FILENAME, STATUS_FILENAME
+from utils import atomic_open
+from logger import get_logger
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    file_id         TEXT PRIMARY KEY,
+    seq             INTEGER NOT NULL,
+    page_number     INTEGER,
+    mod_id          TEXT NOT NULL,
+    mod_name        TEXT,
+    mod_update_date TEXT,
+    jp_upload_date  TEXT,
+    size            TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_translations_mod_date ON translations (mod_id, jp_upload_date DESC);
+CREATE INDEX IF NOT EXISTS idx_translations_upload_date ON translations (jp_upload_date DESC);
+CREATE INDEX IF NOT EXISTS idx_translations_seq ON translations (seq);
+
+CREATE TABLE IF NOT EXISTS apply_status (
+    mod_id          TEXT PRIMARY KEY,
+    applied_file_id TEXT,
+    applied_date    TEXT,
+    data            TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_apply_status_file_id ON apply_status (applied_file_id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# IN句に一度に渡すパラメータ数
+_QUERY_CHUNK = 500
+
+# 同一プロセス内での取り込み処理の重複を防ぐ
+_import_lock = threading.Lock()
+
+
+def file_signature(path):
+    """ファイルの更新検出用シグネチャ（mtime_ns:size）。存在しなければNone"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+class CatalogDB:
+    """
+    翻訳リスト（カタログ）と適用状況を保持するSQLiteストア。
+    WALモードで開くため、GUIとCLIから同時に読み書きしても安全。
+    既存のCSV / JSONは変更を検出したときだけ自動で取り込み、互換用に書き出しも行う。
+    """
+
+    def __init__(self, db_path=None, csv_path=None, status_path=None):
+        self.db_path = db_path or os.path.join(LOGS_DIR, CATALOG_DB_FILENAME)
+        self.csv_path = csv_path or os.path.join(LOGS_DIR, CSV_FILENAME)
+        self.status_path = status_path or os.path.join(LOGS_DIR, STATUS_FILENAME)
+        self.logger = get_logger("CatalogDB")
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- メタ情報 ---
+
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # --- 翻訳リスト ---
+
+    def sync_from_csv(self, force=False):
+        """CSVが前回の取り込み以降に変更されていれば、カタログを入れ替える"""
+        signature = file_signature(self.csv_path)
+        if signature is None:
+            # CSVが削除された場合はカタログも空にする（CSV削除ボタンとの整合性）
+            if self._get_meta("csv_signature") is not None:
+                with self.conn:
+                    self.conn.execute("DELETE FROM translations")
+                    self.conn.execute("DELETE FROM meta WHERE key = 'csv_signature'")
+                return True
+            return False
+        with _import_lock:
+            if not force and self._get_meta("csv_signature") == signature:
+                return False
+
+            rows = []
+            with open(self.csv_path, 'r', encoding=CSV_ENCODING, newline='') as f:
+                for seq, row in enumerate(csv.DictReader(f)):
+                    rows.append((
+                        row['File ID'], seq, row.get('Page Number'), row['MOD ID'], row['MOD Name'],
+                        row.get('Mod-Update-Date'), row['JP-File-Upload-Date'], row.get('Size'),
+                    ))
+
+            with self.conn:
+                self.conn.execute("DELETE FROM translations")
+                # 同じFile IDが複数行ある場合は先に現れた行を残す
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO translations "
+                    "(file_id, seq, page_number, mod_id, mod_name, mod_update_date, jp_upload_date, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._set_meta("csv_signature", signature)
+        self.logger.info(f"翻訳リストCSVをカタログに取り込みました: {len(rows)}件")
+        return True
+
+    def add_translations(self, translations):
+        """
+        新しい翻訳（CSV列名の辞書）をカタログの末尾に追加する。
+        戻り値: 実際に追加された件数（既存のFile IDは無視）
+        """
+        with self.conn:
+            next_seq = self.conn.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM translations").fetchone()[0]
+            added = 0
+            for t in translations:
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO translations "
+                    "(file_id, seq, page_number, mod_id, mod_name, mod_update_date, jp_upload_date, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (t['File ID'], next_seq + added, t.get('Page Number', 0), t['MOD ID'], t['MOD Name'],
+                     t.get('Mod-Update-Date'), t['JP-File-Upload-Date'], t.get('Size')))
+                added += cursor.rowcount
+        return added
+
+    def mark_csv_synced(self):
+        """CSVへの追記をDBにも反映済みであることを記録し、再取り込みを省く"""
+        signature = file_signature(self.csv_path)
+        if signature is not None:
+            with self.conn:
+                self._set_meta("csv_signature", signature)
+
+    def get_file_ids(self):
+        """カタログに登録済みのFile IDの集合"""
+        return {row[0] for row in self.conn.execute("SELECT file_id FROM translations")}
+
+    def get_latest_translations(self, mod_ids=None):
+        """
+        MOD IDごとに最新（JP-File-Upload-Dateが最大）の翻訳を返す。
+        同じ日時の場合はCSVで上にある行を優先する。
+        戻り値: {mod_id: 翻訳の辞書}
+        """
+        query = (
+            "SELECT file_id, mod_id, mod_name, jp_upload_date, size FROM ("
+            "  SELECT *, ROW_NUMBER() OVER (PARTITION BY mod_id ORDER BY jp_upload_date DESC, seq ASC) AS rn"
+            "  FROM translations{where}"
+            ") WHERE rn = 1")
+        if mod_ids is None:
+            return {row["mod_id"]: dict(row) for row in self.conn.execute(query.format(where=""))}
+
+        mod_ids = list(dict.fromkeys(mod_ids))
+        latest = {}
+        for i in range(0, len(mod_ids), _QUERY_CHUNK):
+            chunk = mod_ids[i:i + _QUERY_CHUNK]
+            where = " WHERE mod_id IN (%s)" % ",".join("?" * len(chunk))
+            for row in self.conn.execute(query.format(where=where), chunk):
+                latest[row["mod_id"]] = dict(row)
+        return latest
+
+    # --- 適用状況 ---
+
+    def sync_status_from_json(self):
+        """japanization_status.jsonが前回の取り込み以降に変更されていれば取り込む"""
+        signature = file_signature(self.status_path)
+        if signature is None or self._get_meta("status_signature") == signature:
+            return False
+        try:
+            with open(self.status_path, 'r', encoding='utf-8') as f:
+                status = json.load(f)
+        except (OSError, ValueError):
+            self.logger.warning("ステータスファイルの読み込みに失敗したため取り込みをスキップします")
+            return False
+        with self.conn:
+            self.conn.execute("DELETE FROM apply_status")
+            self._upsert_status(status)
+            self._set_meta("status_signature", signature)
+        self.logger.info(f"適用状況JSONをカタログに取り込みました: {len(status)}件")
+        return True
+
+    def _upsert_status(self, status):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO apply_status (mod_id, applied_file_id, applied_date, data) VALUES (?, ?, ?, ?)",
+            ((mod_id, entry.get('applied_file_id'), entry.get('applied_date'), json.dumps(entry, ensure_ascii=False))
+             for mod_id, entry in status.items()))
+
+    def get_status(self):
+        """適用状況を {mod_id: {...}} の辞書で返す"""
+        return {row["mod_id"]: json.loads(row["data"]) for row in self.conn.execute("SELECT mod_id, data FROM apply_status")}
+
+    def replace_status(self, status):
+        """適用状況を丸ごと置き換え、互換用のJSONも書き出す"""
+        with self.conn:
+            self.conn.execute("DELETE FROM apply_status")
+            self._upsert_status(status)
+        self.export_status_json(status)
+
+    def update_status(self, entries):
+        """指定したMODの適用状況だけを更新し、互換用のJSONも書き出す"""
+        with self.conn:
+            self._upsert_status(entries)
+        self.export_status_json()
+
+    def export_status_json(self, status=None):
+        """適用状況を従来形式のJSONに書き出す（互換用）"""
+        if status is None:
+            status = self.get_status()
+        with atomic_open(self.status_path, 'w', encoding='utf-8') as f:
+            json.dump(status, f, ensure_ascii=False, indent=2)
+        with self.conn:
+            self._set_meta("status_signature", file_signature(self.status_path))
+            self._set_meta("status_exported_at", datetime.now().isoformat())
+
+
+def open_catalog():
+    """既存のCSV / JSONの変更を取り込んだ状態のカタログを開く"""
+    db = CatalogDB()
+    db.sync_from_csv()
+    db.sync_status_from_json()
+    return db
@@ -0,0 +1,127 @@
+"""
+GUIを使わずに各処理を実行するコマンドラインエントリーポイント。
+タスクスケジューラなどから定期実行するために使う。
+
+    python -m cli scrape   # 翻訳リストを全ページ取得
+    python -m cli check    # 翻訳リストの更新チェック
+    python -m cli apply    # 一括日本語化適用
+    python -m cli backup   # MODバックアップ
+    python -m cli cache    # キャッシュの使用量を表示（--clearで削除）
+
+起動を速くするため、各サブコマンドの処理モジュールは実行時に読み込む。
+"""
+import sys
+import argparse
+
+from progress import ConsolePman
+
+# configとreしか読み込まない軽いモジュールなので、引数定義のために起動時に読み込む
+from download_scheduler import ORDERS, parse_size, format_bytes
+
+
+def _parse_bandwidth(text):
+    size = parse_size(text, strict=True)
+    if not size:
+        raise argparse.ArgumentTypeError(f"帯域の指定が不正です: {text}（例: 2MB, 500KB）")
+    return size
+
+
+def _run_scrape(args, pman):
+    from config import SCRAPE_MAX_WORKERS, SCRAPE_REQUESTS_PER_SECOND
+    from translation_scraper import scrape_and_save_to_csv
+    completed = scrape_and_save_to_csv(
+        pman,
+        max_workers=args.workers or SCRAPE_MAX_WORKERS,
+        requests_per_second=args.rate or SCRAPE_REQUESTS_PER_SECOND,
+        use_cache=not args.no_cache,
+        resume=not args.restart,
+    )
+    if not completed:
+        pman.popup_warning("翻訳リストの取得が途中で中断されました。\n再度実行すると続きから再開します。")
+    return 0 if completed else 1
+
+
+def _run_check(args, pman):
+    from translation_checker import check_translation_updates
+    check_translation_updates(pman)
+
+
+def _run_apply(args, pman):
+    from auto_japanizer import run_auto_japanization
+    from config import APPLY_ORDER, APPLY_BANDWIDTH_LIMIT
+    run_auto_japanization(pman, order=args.order or APPLY_ORDER,
+                          bandwidth_limit=args.bandwidth_limit or APPLY_BANDWIDTH_LIMIT)
+
+
+def _run_backup(args, pman):
+    from backup_manager import backup_mods
+    backup_mods(pman)
+
+
+def _run_cache(args, pman):
+    from archive_cache import get_archive_cache
+    from http_client import get_response_cache
+    caches = (("翻訳アーカイブのキャッシュ", get_archive_cache()), ("HTTPレスポンスのキャッシュ", get_response_cache()))
+    for label, cache in caches:
+        if args.clear:
+            cache.clear()
+            pman.popup_info(f"{label}を削除しました。")
+        else:
+            pman.popup_info(f"{label}: {format_bytes(cache.total_bytes())} ({cache.cache_dir})")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description="RimWorld MOD 日本語化インストーラー（GUIなし）")
+    parser.add_argument("-q", "--quiet", action="store_true", help="状態・進捗の表示を省略する")
+    parser.add_argument("-v", "--verbose", action="store_true", help="ログを標準エラー出力にも表示する")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scrape = subparsers.add_parser("scrape", help="翻訳リストを全ページ取得してCSVに保存")
+    scrape.add_argument("--workers", type=int, help="並列取得数")
+    scrape.add_argument("--rate", type=float, help="1秒あたりの最大リクエスト数")
+    scrape.add_argument("--no-cache", action="store_true", help="HTTPキャッシュを使わずに取り直す")
+    scrape.add_argument("--restart", action="store_true", help="前回の中断位置から再開せず最初から取得する")
+    scrape.set_defaults(handler=_run_scrape)
+
+    check = subparsers.add_parser("check", help="最新の翻訳を取得して翻訳リストを更新")
+    check.set_defaults(handler=_run_check)
+
+    apply = subparsers.add_parser("apply", help="適用可能な翻訳を一括適用")
+    apply.add_argument("--order", choices=ORDERS, help="処理順")
+    apply.add_argument("--bandwidth-limit", type=_parse_bandwidth, metavar="SIZE",
+                       help="ダウンロード全体の帯域上限（1秒あたり、例: 2MB）")
+    apply.set_defaults(handler=_run_apply)
+
+    backup = subparsers.add_parser("backup", help="MODの差分バックアップを作成")
+    backup.set_defaults(handler=_run_backup)
+
+    cache = subparsers.add_parser("cache", help="キャッシュの使用量を表示")
+    cache.add_argument("--clear", action="store_true", help="キャッシュをすべて削除する")
+    cache.set_defaults(handler=_run_cache)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.verbose:
+        from logger import logger_manager
+        logger_manager.add_console_handler()
+
+    pman = ConsolePman(quiet=args.quiet)
+    try:
+        exit_code = args.handler(args, pman)
+    except KeyboardInterrupt:
+        pman.popup_error("中断されました。")
+        return 130
+    finally:
+        # HTTPを使ったサブコマンドだけ共有Sessionの接続を閉じる（使わなかった場合に読み込まない）
+        http_client = sys.modules.get("http_client")
+        if http_client is not None:
+            http_client.close_session()
+    if exit_code is None:
+        exit_code = 1 if pman.error_count else 0
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,9 @@ LOCAL_MODS_DIR = r"S:\SteamLibrary\steamapps\common\RimWorld\Mods"
 JAPANIZED_DIR = os.path.join(os.path.dirname(MODS_DIR), "japanized")
 TMP_DIR = os.path.join(JAPANIZED_DIR, "TMP")
 OLD_DIR = os.path.join(JAPANIZED_DIR, "old")
+# ダウンロード済み翻訳アーカイブのキャッシュ（File IDごと、上限を超えたら古い順に削除）
+ARCHIVE_CACHE_DIR = os.path.join(JAPANIZED_DIR, "archive_cache")
+ARCHIVE_CACHE_MAX_BYTES = 1024 * 1024 * 1024
 
 # バックアップ保存先ルートディレクトリ
 BACKUP_ROOT = os.path.join(JAPANIZED_DIR, "backup")
@@ -26,10 +29,71 @@ STEAM_URL_FMT = "https://steamcommunity.com/sharedfiles/filedetails/?id={}"
 RIM2GAME_URL_FMT = "https://rimworld.2game.info/detail.php?id={}"
 
 REFERER_FMT = "https://rimworld.2game.info/detail.php?id={}"
+# 全HTTP通信で共通のUser-Agent（http_client.pyで使用）
 USER_AGENT = "RimWorldJapanizer/1.0 (+https://rimworld.2game.info)"
 CHUNK_SIZE = 1024 * 100
 TIMEOUT = 30
 
+# 一括日本語化のパイプライン（ステージごとの同時実行数）
+APPLY_DOWNLOAD_WORKERS = 4
+APPLY_EXTRACT_WORKERS = 2
+APPLY_PLACE_WORKERS = 2
+# 一括日本語化の処理順（カタログのSize列を使用）
+#   "largest_first": 大きいものから（並列ダウンロード時の全体の所要時間を短くする）
+#   "small_first": 小さいものから（完了件数が早く増える）
+#   "catalog": 翻訳リストの順
+APPLY_ORDER = "largest_first"
+APPLY_BANDWIDTH_LIMIT = None  # ダウンロード全体の帯域上限（バイト/秒、Noneで無制限）
+APPLY_ASSUMED_BYTES_PER_SECOND = 1024 * 1024  # 開始前の所要時間見積もりに使う回線速度
+# 複数の配置場所へのJapaneseフォルダの展開方法
+#   "link": 1箇所目だけコピーし、残りはリフリンク/ハードリンク（別ドライブなどで不可ならコピー）
+#   "copy": すべての配置場所へ個別にコピー
+PLACEMENT_FANOUT_MODE = "link"
+
+# HTTP接続プール関連
+HTTP_POOL_MAXSIZE = 8  # ホストごとに保持するkeep-alive接続数
+HTTP_MAX_RETRIES = 3  # 接続エラー・5xx応答時の再試行回数
+HTTP_BACKOFF_FACTOR = 0.5  # 再試行間隔の係数（0.5, 1.0, 2.0秒…）
+ENCODING_DETECT_PREFIX_BYTES = 64 * 1024  # 文字コード宣言が無い場合にchardetへ渡す先頭バイト数
+
+# HTTPレスポンスキャッシュ（ETag / If-Modified-Sinceで再検証）
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_DIR = os.path.join(LOGS_DIR, "http_cache")
+HTTP_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
 # CSVファイル関連
 CSV_FILENAME = "rimworld_translation_list.csv"
-CSV_ENCODING = 'utf-8-sig'
\ No newline at end of file
+CSV_ENCODING = 'utf-8-sig'
+CSV_HEADER = ["Page Number", "File ID", "MOD ID", "MOD Name", "Mod-Update-Date", "JP-File-Upload-Date", "Size"]
+STATUS_FILENAME = "japanization_status.json"
+# 適用状況の追記専用ジャーナル（一定件数ごとにスナップショットへ反映）
+STATUS_JOURNAL_FILENAME = "japanization_status.journal.jsonl"
+STATUS_JOURNAL_FSYNC_EVERY = 16  # 何件追記するごとにfsyncするか
+STATUS_JOURNAL_COMPACT_EVERY = 256  # 何件たまったらスナップショットへ反映するか
+# 翻訳リスト・適用状況のSQLiteストア（CSV / JSONから自動取り込み）
+CATALOG_DB_FILENAME = "erin_catalog.sqlite3"
+# インストール済みMODのメタデータキャッシュ（フォルダ・About.xmlのmtimeで再利用判定）
+MOD_INVENTORY_CACHE_FILENAME = "mod_inventory_cache.json"
+MOD_SCAN_WORKERS = 8  # About.xmlを並列に解析するスレッド数
+# バックアップ比較用のファイルごとのハッシュキャッシュ（パス・サイズ・mtimeで再利用判定）
+BACKUP_HASH_CACHE_FILENAME = ".file_hashes.json"  # 各バックアップフォルダ直下に保存
+MOD_HASH_CACHE_FILENAME = "mod_file_hashes.json"  # 現行MOD用（ログフォルダに保存）
+# 指紋計算: この大きさ以上のファイルはmmapで読み、ブロックごとにハッシュに渡す
+FINGERPRINT_MMAP_THRESHOLD = 1024 * 1024
+FINGERPRINT_BLOCK_SIZE = 8 * 1024 * 1024
+# バックアップ済みMODの指紋の索引（BACKUP_ROOT直下に保存）
+BACKUP_INDEX_FILENAME = "backup_index.json"
+# バックアップのパイプライン（指紋計算とコピーを並行して行う）
+BACKUP_HASH_WORKERS = 4  # 指紋を並列に計算するMOD数
+BACKUP_COPY_WORKERS = 2  # 並列にコピーするMOD数
+BACKUP_IO_CONCURRENCY = 4  # ディスクを読み書きする処理（指紋計算・コピー）の同時実行数の上限。HDDなら1〜2を推奨
+BACKUP_COPY_BUFFER_SIZE = 8 * 1024 * 1024  # カーネル内でコピーできない場合の読み書きバッファ
+# 更新チェックで遡るページ数の上限（これを超える場合は全ページ取得を推奨）
+INCREMENTAL_SYNC_MAX_PAGES = 50
+
+# 翻訳リスト取得（スクレイピング）関連
+SCRAPE_MAX_WORKERS = 4  # 同時に取得するページ数の上限
+SCRAPE_REQUESTS_PER_SECOND = 2.0  # サイトへの1秒あたりのリクエスト数上限
+# 中断した全ページ取得を再開する期限（これより古いチェックポイントは破棄して最初から取得する。
+# 時間が経つと新しい投稿でページがずれ、取得済みの行と新しいページの行が食い違うため）
+SCRAPE_CHECKPOINT_MAX_AGE_HOURS = 24
@@ -0,0 +1,101 @@
+import re
+
+from config import APPLY_ORDER, APPLY_ASSUMED_BYTES_PER_SECOND
+
+# 単位の"B"は省略可（"2M", "1.5Ki"なども受け付ける）
+_SIZE_RE = re.compile(r'([\d.,]+)\s*([KMGT]i?B?|B|バイト)?', re.IGNORECASE)
+_UNIT_BYTES = {
+    '': 1, 'B': 1, 'バイト': 1,
+    'K': 1024, 'KI': 1024, 'KB': 1024, 'KIB': 1024,
+    'M': 1024 ** 2, 'MI': 1024 ** 2, 'MB': 1024 ** 2, 'MIB': 1024 ** 2,
+    'G': 1024 ** 3, 'GI': 1024 ** 3, 'GB': 1024 ** 3, 'GIB': 1024 ** 3,
+    'T': 1024 ** 4, 'TI': 1024 ** 4, 'TB': 1024 ** 4, 'TIB': 1024 ** 4,
+}
+
+ORDERS = ("largest_first", "small_first", "catalog")
+
+
+def parse_size(text, strict=False):
+    """
+    翻訳リストのSize列（例: "1.5MB", "820 KB", "2.0M"）をバイト数に変換する（解釈できなければNone）。
+    strict=Trueの場合は文字列全体がサイズの表記でなければNone（コマンドライン引数の検証用）。
+    """
+    if not text:
+        return None
+    text = str(text).strip()
+    match = _SIZE_RE.fullmatch(text) if strict else _SIZE_RE.search(text)
+    if not match:
+        return None
+    try:
+        value = float(match.group(1).replace(',', ''))
+    except ValueError:
+        return None
+    unit = (match.group(2) or '').upper()
+    return int(value * _UNIT_BYTES.get(unit, 1))
+
+
+def format_bytes(size):
+    """バイト数を表示用の文字列にする"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+
+
+def format_duration(seconds):
+    """秒数を表示用の文字列にする"""
+    seconds = int(seconds + 0.5)
+    if seconds < 60:
+        return f"{seconds}秒"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}分{seconds:02d}秒"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}時間{minutes:02d}分"
+
+
+def estimate_sizes(applicable, is_cached=None):
+    """
+    適用する翻訳ごとのダウンロード量を見積もる。
+    Size列が解釈できないものは、解釈できたものの中央値で埋める。キャッシュ済みのものは0。
+    戻り値: {file_id: 見積もりバイト数}
+    """
+    parsed = {}
+    for info in applicable:
+        translation = info['translation']
+        parsed[translation['file_id']] = parse_size(translation.get('size'))
+
+    known = sorted(size for size in parsed.values() if size is not None)
+    fallback = known[len(known) // 2] if known else 0
+
+    estimates = {}
+    for file_id, size in parsed.items():
+        if is_cached and is_cached(file_id):
+            estimates[file_id] = 0
+        else:
+            estimates[file_id] = size if size is not None else fallback
+    return estimates
+
+
+def order_applicable(applicable, estimates, order=APPLY_ORDER):
+    """
+    見積もりサイズに基づいて処理順を並べ替える。
+    largest_first: 並列実行時の全体の所要時間が短くなる（大きいものを先に始める）
+    small_first: 完了件数が早く増える
+    catalog: 並べ替えない
+    """
+    if order == "catalog":
+        return list(applicable)
+    if order not in ORDERS:
+        raise ValueError(f"不明な処理順です: {order}")
+    # sortedは安定なので、同じサイズのものは翻訳リストの順を保つ
+    return sorted(applicable, key=lambda info: estimates[info['translation']['file_id']],
+                  reverse=(order == "largest_first"))
+
+
+def estimate_duration(total_bytes, bytes_per_second=None):
+    """総ダウンロード量から所要時間（秒）を見積もる。帯域上限が想定速度より低ければ上限で計算する"""
+    rate = APPLY_ASSUMED_BYTES_PER_SECOND
+    if bytes_per_second:
+        rate = min(rate, bytes_per_second)
+    return total_bytes / rate
@@ -1,30 +1,130 @@
 import os
-import requests
+import json
 import zipfile
 import rarfile
+try:
+    import py7zr
+    HAS_PY7ZR = True
+except ImportError:
+    HAS_PY7ZR = False
 
-from config import REFERER_FMT, USER_AGENT, CHUNK_SIZE, TIMEOUT
+from config import REFERER_FMT, CHUNK_SIZE
+from http_client import http_get
+from utils import japanese_dir_match_rank, find_japanese_dir, get_current_rimworld_version, remove_quietly
+from logger import get_logger
 
-def download_zip(url, mod_id, zip_path, pman):
-    """ファイルをダウンロードする"""
+# アーカイブ形式の判定に使う先頭バイト
+_ARCHIVE_SIGNATURES = (
+    (b"PK\x03\x04", "zip"),
+    (b"PK\x05\x06", "zip"),  # 空のZIP
+    (b"Rar!\x1a\x07\x00", "rar"),  # RAR 4.x
+    (b"Rar!\x1a\x07\x01\x00", "rar"),  # RAR 5.x
+    (b"7z\xbc\xaf\x27\x1c", "7z"),
+)
+_SNIFF_BYTES = 8
+
+def sniff_archive_type(head):
+    """ファイル先頭のバイト列からアーカイブ形式を判定する（不明ならNone）"""
+    for signature, archive_type in _ARCHIVE_SIGNATURES:
+        if head.startswith(signature):
+            return archive_type
+    return None
+
+def _load_part_meta(meta_path, url):
+    """途中まで落とした.partファイルの検証子（同じURLのものだけ有効）"""
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("url") == url:
+            return meta
+    except (OSError, ValueError):
+        pass
+    return None
+
+def _save_part_meta(meta_path, url, response):
+    meta = {"url": url, "etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+def _read_head(path):
+    """再開時、ダウンロード済みの部分から形式判定用の先頭バイトを読む"""
+    with open(path, "rb") as f:
+        return f.read(_SNIFF_BYTES)
+
+def download_zip(url, mod_id, zip_path, pman, limiter=None):
+    """
+    ファイルをダウンロードする。
+    zip_path + ".part" に書き込み、前回の途中までのファイルがあればRangeリクエストで続きから取得する
+    （サーバーがRangeに対応していなければ最初から取り直す）。
+    受信しながら先頭バイトからアーカイブ形式を判定するため、保存後に読み直す必要はない。
+    受信したサイズがContent-Lengthと一致しない場合はエラーとする。
+    中断・エラー時は.partファイルを残し、次回の再開に使う。
+    limiter（http_client.RateLimiter）を渡すと受信バイト数で帯域を制限する（複数のダウンロードで共有可）。
+    戻り値: {'path', 'size', 'archive_type'}（archive_typeは形式不明ならNone）
+    """
+    part_path = zip_path + ".part"
+    meta_path = part_path + ".json"
     pman.set_status("ファイルダウンロード中…")
-    headers = {
-        "Referer": REFERER_FMT.format(mod_id),
-        "User-Agent": USER_AGENT
-    }
     try:
-        with requests.get(url, headers=headers, stream=True, timeout=TIMEOUT) as r:
+        head = b""
+        offset = 0
+        headers = {}
+        part_meta = _load_part_meta(meta_path, url) if os.path.exists(part_path) else None
+        if part_meta:
+            offset = os.path.getsize(part_path)
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            # 途中でファイルが差し替えられていたら、サーバーに最初から返してもらう
+            validator = part_meta.get("etag") or part_meta.get("last_modified")
+            if validator:
+                headers["If-Range"] = validator
+
+        with http_get(url, referer=REFERER_FMT.format(mod_id), stream=True, headers=headers) as r:
+            resumed = offset and r.status_code == 206 and r.headers.get("Content-Range", "").startswith(f"bytes {offset}-")
+            if offset and (r.status_code == 416 or (r.status_code == 206 and not resumed)):
+                # 範囲外、または要求した位置以外からの部分応答（サーバー側のファイルが変わった等）は最初から取り直す
+                r.close()
+                remove_quietly(part_path)
+                remove_quietly(meta_path)
+                return download_zip(url, mod_id, zip_path, pman, limiter)
             r.raise_for_status()
-            with open(zip_path, "wb") as f:
+            if r.status_code == 206 and not resumed:
+                # Rangeを送っていないのに部分応答が返った（ファイル全体として保存できない）
+                raise IOError(f"サーバーが要求していない部分応答を返しました (Content-Range: {r.headers.get('Content-Range')})")
+
+            if resumed:
+                pman.set_status(f"ファイルダウンロード再開中…（{offset // 1024}KBから）")
+                head = _read_head(part_path)
+                mode = "ab"
+            else:
+                offset = 0
+                mode = "wb"
+            _save_part_meta(meta_path, url, r)
+
+            expected_size = r.headers.get("Content-Length")
+            expected_size = offset + int(expected_size) if expected_size and expected_size.isdigit() else None
+            size = offset
+            with open(part_path, mode) as f:
                 for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
                     if chunk:
+                        if limiter:
+                            limiter.acquire(len(chunk))
+                        if len(head) < _SNIFF_BYTES:
+                            head += chunk[:_SNIFF_BYTES - len(head)]
                         f.write(chunk)
+                        size += len(chunk)
+
+        if expected_size is not None and size != expected_size:
+            raise IOError(f"ダウンロードしたサイズが一致しません ({size} / {expected_size} バイト)")
+
+        os.replace(part_path, zip_path)
+        remove_quietly(meta_path)
+        return {
+            'path': zip_path,
+            'size': size,
+            'archive_type': sniff_archive_type(head),
+        }
     except Exception as e:
-        if os.path.exists(zip_path):
-            try:
-                os.remove(zip_path)
-            except OSError:
-                pass
         pman.popup_error(f"ダウンロード中にエラーが発生しました。\n{e}")
         pman.set_status("ダウンロード失敗")
         raise
@@ -38,15 +138,17 @@ def get_archive_type(file_path):
             return "rar"
     except:
         pass
+    if HAS_PY7ZR and py7zr.is_7zfile(file_path):
+        return "7z"
     return None
 
 def is_archive_file(path):
     """ファイルがアーカイブ形式か判定する"""
     return get_archive_type(path) is not None
 
-def extract_archive(archive_path, unpack_dir, pman):
-    """アーカイブファイル（ZIP/RAR）を展開する"""
-    archive_type = get_archive_type(archive_path)
+def extract_archive(archive_path, unpack_dir, pman, archive_type=None):
+    """アーカイブファイル（ZIP/RAR/7z）を展開する（形式が判定済みならarchive_typeで渡す）"""
+    archive_type = archive_type or get_archive_type(archive_path)
     
     if archive_type == "zip":
         pman.set_status("ZIPアーカイブ展開中…")
@@ -67,5 +169,118 @@ def extract_archive(archive_path, unpack_dir, pman):
             pman.popup_error(f"RARアーカイブ展開中にエラーが発生しました。\n{e}")
             pman.set_status("RAR展開失敗。")
             raise
+            
+    elif archive_type == "7z":
+        pman.set_status("7zアーカイブ展開中…")
+        try:
+            with _open_archive(archive_path, archive_type) as zf:
+                zf.extractall(path=unpack_dir)
+        except Exception as e:
+            pman.popup_error(f"7zアーカイブ展開中にエラーが発生しました。\n{e}")
+            pman.set_status("7z展開失敗。")
+            raise
     else:
         raise ValueError(f"サポートされていないアーカイブ形式です: {archive_path}")
+
+def _open_archive(archive_path, archive_type):
+    if archive_type == "zip":
+        return zipfile.ZipFile(archive_path, 'r')
+    if archive_type == "rar":
+        return rarfile.RarFile(archive_path, 'r')
+    if archive_type == "7z":
+        if not HAS_PY7ZR:
+            raise ValueError(f"7z形式の展開にはpy7zrが必要です: {archive_path}")
+        return py7zr.SevenZipFile(archive_path, 'r')
+    raise ValueError(f"サポートされていないアーカイブ形式です: {archive_path}")
+
+def _member_names(archive, archive_type):
+    """アーカイブのメンバー名一覧（フォルダは"/"で終わる）"""
+    if archive_type == "7z":
+        return [info.filename + "/" if info.is_directory else info.filename for info in archive.list()]
+    return [info.filename for info in archive.infolist()]
+
+def _extract_members(archive, archive_type, names, unpack_dir):
+    """指定したメンバーだけを展開する"""
+    if archive_type == "7z":
+        archive.extract(path=unpack_dir, targets=[name.rstrip("/") for name in names])
+        return
+    for name in names:
+        archive.extract(name, unpack_dir)
+
+def rank_japanese_candidates(member_names):
+    """
+    アーカイブのメンバー名一覧（セントラルディレクトリ）からJapaneseフォルダの候補を探し、
+    優先順に並べて返す。展開前に判定するため、ファイルシステムは走査しない。
+    優先順位:
+      1. フォルダ名の一致度（完全一致 > 大文字小文字違い > "Japanese"で始まる）
+      2. 親フォルダがLanguagesであること
+      3. パスに現在のRimWorldバージョンのフォルダを含むこと
+      4. 階層が浅いこと
+      5. 含まれるファイル数が多いこと
+      6. パス名（辞書順）
+    他の候補の内側にある候補は除外する。
+    戻り値: [候補フォルダのメンバー名プレフィックス（"/"区切り）, ...]
+    """
+    current_version = get_current_rimworld_version()
+    candidates = {}  # プレフィックス -> [一致度, ファイル数, 構成要素]
+    for name in member_names:
+        parts = [p for p in name.replace("\\", "/").split("/") if p]
+        if not name.endswith("/"):
+            parts = parts[:-1]  # ファイル名を除く
+        for i, part in enumerate(parts):
+            rank = japanese_dir_match_rank(part)
+            if rank is None:
+                continue
+            prefix = "/".join(parts[:i + 1])
+            entry = candidates.setdefault(prefix, [rank, 0, parts[:i + 1]])
+            if not name.endswith("/"):
+                entry[1] += 1
+
+    # 他の候補の内側にある候補を除外
+    outer = [p for p in candidates
+             if not any(p != other and p.startswith(other + "/") for other in candidates)]
+
+    def sort_key(prefix):
+        rank, file_count, parts = candidates[prefix]
+        under_languages = len(parts) >= 2 and parts[-2].lower() == "languages"
+        has_version = any(part.lstrip("vV") == current_version for part in parts[:-1])
+        return (rank, not under_languages, not has_version, len(parts), -file_count, prefix.lower())
+
+    return sorted(outer, key=sort_key)
+
+def extract_japanese_dir(archive_path, unpack_dir, pman, archive_type=None):
+    """
+    アーカイブからJapaneseフォルダの部分だけを展開する。
+    候補はメンバー名一覧から決め、最優先の候補配下のメンバーのみを展開する。
+    メンバー名から候補が見つからない場合は全体を展開し、展開先のフォルダ構成から探す。
+    戻り値: 展開したJapaneseフォルダのパス（見つからなければNone）
+    """
+    archive_type = archive_type or get_archive_type(archive_path)
+    label = (archive_type or "").upper()
+    pman.set_status(f"{label}アーカイブからJapaneseフォルダを展開中…")
+    try:
+        with _open_archive(archive_path, archive_type) as archive:
+            names = _member_names(archive, archive_type)
+            candidates = rank_japanese_candidates(names)
+            if candidates:
+                if len(candidates) > 1:
+                    get_logger("RimWorldJapanizer").info(f"Japaneseフォルダ候補が複数あります。{candidates[0]} を使用します: {candidates}")
+                prefix = candidates[0] + "/"
+                _extract_members(archive, archive_type,
+                                 [name for name in names if name.replace("\\", "/").startswith(prefix)], unpack_dir)
+    except Exception as e:
+        pman.popup_error(f"{label}アーカイブ展開中にエラーが発生しました。\n{e}")
+        pman.set_status(f"{label}展開失敗。")
+        raise
+
+    if not candidates:
+        # メンバー名からは判定できなかった（パスの区切りや文字コードが特殊な場合など）
+        get_logger("RimWorldJapanizer").info(f"メンバー名からJapaneseフォルダを特定できないため全体を展開します: {archive_path}")
+        extract_archive(archive_path, unpack_dir, pman, archive_type)
+        return find_japanese_dir(unpack_dir)
+
+    jp_dir = os.path.join(unpack_dir, *candidates[0].split("/"))
+    if os.path.isdir(jp_dir):
+        return jp_dir
+    # 展開時にパスが正規化された場合は展開先から探す
+    return find_japanese_dir(unpack_dir)
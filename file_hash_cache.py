@@ -0,0 +1,118 @@
+import os
+import json
+import threading
+
+from config import BACKUP_ROOT, LOGS_DIR, BACKUP_HASH_CACHE_FILENAME, MOD_HASH_CACHE_FILENAME
+from fingerprint import HASH_ALGORITHM
+from utils import atomic_open
+
+_CACHE_VERSION = 2
+
+
+class FileHashCache:
+    """
+    ファイルごとのハッシュの永続キャッシュ。ディレクトリツリー単位（接頭辞）でまとめて保持する。
+    (パス, サイズ, mtime_ns) が前回と同じファイルは読み直さずに保存済みのハッシュを使う。
+    """
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._trees = None  # {接頭辞: {相対パス: [サイズ, mtime_ns, ハッシュ]}}
+        self._dirty = False
+
+    def _load(self):
+        if self._trees is not None:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # ハッシュのアルゴリズムが変わった場合は作り直す
+            valid = data.get('version') == _CACHE_VERSION and data.get('algorithm') == HASH_ALGORITHM
+            self._trees = data['trees'] if valid else {}
+        except (OSError, ValueError, KeyError, AttributeError):
+            self._trees = {}
+
+    def get_tree(self, prefix):
+        """ツリーのキャッシュ済みエントリ {相対パス: [サイズ, mtime_ns, ハッシュ]}"""
+        with self._lock:
+            self._load()
+            return dict(self._trees.get(prefix, {}))
+
+    def set_tree(self, prefix, entries):
+        """ツリーのエントリを置き換える（消えたファイルのエントリも削除される）"""
+        with self._lock:
+            self._load()
+            if self._trees.get(prefix) != entries:
+                self._trees[prefix] = entries
+                self._dirty = True
+
+    def save(self):
+        """変更があればアトミックに書き出す"""
+        with self._lock:
+            if not self._dirty:
+                return False
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with atomic_open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': _CACHE_VERSION, 'algorithm': HASH_ALGORITHM, 'trees': self._trees}, f, ensure_ascii=False, separators=(',', ':'))
+            self._dirty = False
+            return True
+
+
+# 開いているキャッシュ（キャッシュファイルのパス → FileHashCache）
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _backup_dir_of(dir_path):
+    """dir_pathがバックアップフォルダ（BACKUP_ROOT/backup_*）の中ならそのバックアップフォルダを返す"""
+    root = os.path.abspath(BACKUP_ROOT)
+    try:
+        rel = os.path.relpath(os.path.abspath(dir_path), root)
+    except ValueError:  # 別ドライブ
+        return None
+    first = rel.split(os.sep, 1)[0]
+    if not first.startswith("backup_"):
+        return None
+    return os.path.join(root, first)
+
+
+def get_hash_cache(dir_path):
+    """
+    ディレクトリに対応するキャッシュと、キャッシュ内でのキーの接頭辞を返す。
+    バックアップ内のディレクトリはそのバックアップフォルダ直下のキャッシュ（バックアップと一緒に残る）、
+    それ以外（現行のMODフォルダ）はログフォルダの共通キャッシュを使う。
+    戻り値: (FileHashCache, 接頭辞)
+    """
+    backup_dir = _backup_dir_of(dir_path)
+    if backup_dir:
+        cache_path = os.path.join(backup_dir, BACKUP_HASH_CACHE_FILENAME)
+        prefix = os.path.relpath(os.path.abspath(dir_path), backup_dir).replace(os.sep, '/')
+    else:
+        cache_path = os.path.join(LOGS_DIR, MOD_HASH_CACHE_FILENAME)
+        prefix = os.path.abspath(dir_path).replace(os.sep, '/')
+
+    with _caches_lock:
+        cache = _caches.get(cache_path)
+        if cache is None:
+            cache = _caches[cache_path] = FileHashCache(cache_path)
+    return cache, prefix
+
+
+def save_all(logger=None):
+    """開いているキャッシュの変更をすべて書き出す"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        try:
+            cache.save()
+        except OSError as e:
+            if logger:
+                logger.warning(f"ハッシュキャッシュの保存に失敗: {cache.cache_path} - {e}")
+
+
+def forget(dir_path):
+    """削除したバックアップフォルダのキャッシュを閉じる（保存しない）"""
+    cache_path = os.path.join(os.path.abspath(dir_path), BACKUP_HASH_CACHE_FILENAME)
+    with _caches_lock:
+        _caches.pop(cache_path, None)
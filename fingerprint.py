@@ -0,0 +1,184 @@
+import os
+import mmap
+import hashlib
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+from config import FINGERPRINT_MMAP_THRESHOLD, FINGERPRINT_BLOCK_SIZE
+
+# キャッシュ・索引に記録し、アルゴリズムが変わったら作り直す
+HASH_ALGORITHM = "xxh3_128" if HAS_XXHASH else "blake2b-128"
+
+
+def _new_hasher():
+    if HAS_XXHASH:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def list_files(dir_path):
+    """
+    ディレクトリ配下のファイルを (相対パス, サイズ, mtime_ns) で列挙する（相対パスは"/"区切り・ソート済み）。
+    シンボリックリンクのフォルダはたどらず（循環を避けるため）、リンクが切れたものと同様にリンク自体の情報で列挙する。
+    """
+    files = []
+    stack = [("", dir_path)]
+    while stack:
+        rel_dir, full_dir = stack.pop()
+        with os.scandir(full_dir) as entries:
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((rel_path, entry.path))
+                else:
+                    st = entry.stat(follow_symlinks=entry.is_file())
+                    files.append((rel_path, st.st_size, st.st_mtime_ns))
+    files.sort()
+    return files
+
+
+def hash_file(path):
+    """
+    ファイル内容全体のハッシュ。
+    FINGERPRINT_MMAP_THRESHOLD以上のファイルはmmapでマップし、FINGERPRINT_BLOCK_SIZEずつハッシュに渡す
+    （読み込み用のバッファを確保・コピーしない）。
+    列挙後に切り詰められた場合に備え、サイズは開いたファイルから取り直す。
+    """
+    hasher = _new_hasher()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= FINGERPRINT_MMAP_THRESHOLD:
+            _update_mapped(hasher, f)
+        elif size:
+            hasher.update(f.read())
+    return hasher.hexdigest()
+
+
+def _update_mapped(hasher, f):
+    try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # サイズを取った直後に空にされた（空のファイルはマップできない）
+        return
+    with mapped:
+        view = memoryview(mapped)
+        try:
+            for offset in range(0, len(mapped), FINGERPRINT_BLOCK_SIZE):
+                hasher.update(view[offset:offset + FINGERPRINT_BLOCK_SIZE])
+        finally:
+            view.release()
+
+
+def combine(entries):
+    """
+    ファイルごとのハッシュからツリーの指紋を作る。
+    entries: ソート済みの (相対パス, サイズ, ファイルのハッシュ) の列。mtimeは含めない。
+    """
+    hasher = _new_hasher()
+    for rel_path, size, digest in entries:
+        hasher.update(f"{rel_path}\0{size}\0{digest}\n".encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def stat_digest(files):
+    """list_filesの結果（相対パス・サイズ・mtime）のダイジェスト。内容を読まない安価な変更検出用"""
+    # combineのハッシュの位置にmtime_nsを入れる
+    return combine(files)
+
+
+def fingerprint_tree(dir_path, cached=None, on_file=None, files=None):
+    """
+    ディレクトリの内容の指紋を計算する（ファイルの相対パス・サイズ・内容から決まり、mtimeには依存しない）。
+    cached: {相対パス: [サイズ, mtime_ns, ハッシュ]} サイズとmtimeが一致するファイルは読まずにこのハッシュを使う
+    on_file(処理済み数, 総数, 読み込んだか): 進捗通知
+    files: list_filesの結果（走査済みなら渡すと再走査しない）
+    戻り値: (指紋, 新しいキャッシュエントリ, 読み込んだファイル数, 読み込んだバイト数)
+    """
+    cached = cached or {}
+    if files is None:
+        files = list_files(dir_path)
+    total = len(files)
+    entries = []
+    new_cache = {}
+    hashed_files = hashed_bytes = 0
+    for i, (rel_path, size, mtime_ns) in enumerate(files):
+        entry = cached.get(rel_path)
+        hashed = False
+        if entry and entry[0] == size and entry[1] == mtime_ns:
+            digest = entry[2]
+        else:
+            try:
+                digest = hash_file(os.path.join(dir_path, rel_path))
+                hashed = True
+                hashed_files += 1
+                hashed_bytes += size
+            except OSError:
+                # 読めないファイルはパスとサイズのみで指紋に含める（キャッシュしない）
+                digest = ""
+        if digest:
+            new_cache[rel_path] = [size, mtime_ns, digest]
+        entries.append((rel_path, size, digest))
+        if on_file:
+            on_file(i + 1, total, hashed)
+    return combine(entries), new_cache, hashed_files, hashed_bytes
+
+
+def _legacy_dir_hash(dir_path):
+    """従来のbackup_manager._calculate_dir_hash（MD5・mtime込み・1MB以下のファイルの先頭/末尾8KBのみ）。ベンチマークの比較用"""
+    hasher = hashlib.md5()
+    file_paths = []
+    for root, dirs, files in os.walk(dir_path):
+        for file in files:
+            file_paths.append(os.path.relpath(os.path.join(root, file), dir_path))
+    file_paths.sort()
+    for rel_path in file_paths:
+        full_path = os.path.join(dir_path, rel_path)
+        hasher.update(rel_path.encode('utf-8'))
+        file_size = os.path.getsize(full_path)
+        hasher.update(str(file_size).encode('utf-8'))
+        hasher.update(str(os.path.getmtime(full_path)).encode('utf-8'))
+        if file_size <= 1024 * 1024:
+            with open(full_path, 'rb') as f:
+                chunk_size = min(8192, file_size)
+                if file_size > 0:
+                    hasher.update(f.read(chunk_size))
+                    if file_size > chunk_size * 2:
+                        f.seek(-chunk_size, 2)
+                        hasher.update(f.read(chunk_size))
+    return hasher.hexdigest()
+
+
+if __name__ == '__main__':
+    # ベンチマーク: MODフォルダを引数に指定して実行する
+    #   python fingerprint.py <MODフォルダ> ...
+    # OSのファイルキャッシュに載った状態で比べるため、各フォルダを一度読んでから計測する
+    import sys
+    import time
+
+    paths = sys.argv[1:]
+    if not paths:
+        print("使い方: python fingerprint.py <MODフォルダ> ...")
+        sys.exit(1)
+
+    total_bytes = sum(size for path in paths for _, size, _ in list_files(path))
+    total_files = sum(len(list_files(path)) for path in paths)
+    print(f"対象: {len(paths)}フォルダ, {total_files:,}ファイル, {total_bytes / 1024 / 1024:,.1f}MB")
+    for path in paths:
+        fingerprint_tree(path)
+
+    def _bench(name, func, bytes_read):
+        start = time.perf_counter()
+        for path in paths:
+            func(path)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed:,.3f}秒 ({total_files / elapsed:,.0f}ファイル/秒, 内容 {bytes_read / 1024 / 1024 / elapsed:,.1f}MB/秒)")
+        return elapsed
+
+    legacy_bytes = sum(min(size, 16384) for path in paths for _, size, _ in list_files(path) if size <= 1024 * 1024)
+    legacy = _bench("従来 (MD5, 先頭/末尾8KB・1MB以下のみ)", _legacy_dir_hash, legacy_bytes)
+    full = _bench(f"全内容 ({HASH_ALGORITHM}, mmap)", lambda path: fingerprint_tree(path), total_bytes)
+    print(f"全内容を読む指紋の所要時間は従来の {full / legacy:.2f}倍（読み込み量は {total_bytes / max(legacy_bytes, 1):.1f}倍）")
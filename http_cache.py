@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from config import HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES
+from utils import atomic_open, evict_lru, remove_quietly
+
+# 再検証後のレスポンス復元に必要なヘッダーのみ保存する
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class ResponseCache:
+    """
+    URLをキーにしたレスポンス本文のディスクキャッシュ。
+    ETag / Last-Modified を保存し、条件付きリクエストで再検証する。
+    合計サイズがmax_bytesを超えたら最終利用が古いものから削除する。
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".body"
+
+    def load(self, url):
+        """キャッシュ済みのエントリを返す（無い・壊れている場合はNone）"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("url") != url:
+                return None
+            with open(body_path, "rb") as f:
+                meta["body"] = f.read()
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, entry):
+        """エントリの検証子から条件付きリクエスト用ヘッダーを作る"""
+        headers = {}
+        if entry.get("headers", {}).get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry.get("headers", {}).get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def store(self, url, response):
+        """検証子付きの200レスポンスを保存する（検証子が無ければ保存しない）"""
+        headers = {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers}
+        if "ETag" not in headers and "Last-Modified" not in headers:
+            return False
+
+        body = response.content
+        if len(body) > self.max_bytes:
+            return False
+
+        meta_path, body_path = self._paths(url)
+        meta = {"url": url, "headers": headers, "stored_at": time.time(), "size": len(body)}
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with atomic_open(body_path, "wb") as f:
+                f.write(body)
+            with atomic_open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            self._evict()
+        return True
+
+    def touch(self, url):
+        """304で再利用したエントリの最終利用時刻を更新する"""
+        _, body_path = self._paths(url)
+        try:
+            os.utime(body_path, None)
+        except OSError:
+            pass
+
+    def clear(self):
+        """キャッシュをすべて削除する"""
+        with self._lock:
+            if not os.path.isdir(self.cache_dir):
+                return
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file():
+                    remove_quietly(entry.path)
+
+    def total_bytes(self):
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        return sum(entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.is_file())
+
+    def _evict(self):
+        """合計サイズが上限を超えていれば最終利用の古い順に削除する（ロック取得済みで呼ぶ）"""
+        evict_lru(self.cache_dir, ".body", self.max_bytes, self._remove_entry)
+
+    @staticmethod
+    def _remove_entry(body_path):
+        for path in (body_path, body_path[:-len(".body")] + ".json"):
+            remove_quietly(path)
@@ -0,0 +1,201 @@
+import codecs
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from requests.structures import CaseInsensitiveDict
+
+from config import USER_AGENT, TIMEOUT, HTTP_POOL_MAXSIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, ENCODING_DETECT_PREFIX_BYTES, HTTP_CACHE_ENABLED
+from http_cache import ResponseCache
+
+_session = None
+_session_lock = threading.Lock()
+
+_response_cache = ResponseCache()
+
+# ホストごとに解決済みの文字コード（セッション中のみ保持）
+_host_encodings = {}
+_host_encodings_lock = threading.Lock()
+
+_CONTENT_TYPE_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+_META_SCAN_BYTES = 4096
+
+
+class RateLimiter:
+    """
+    トークンバケット方式の流量制限（スレッド間で共有）。
+    リクエスト数の制限（1リクエスト=1トークン）にも、帯域の制限（1バイト=1トークン）にも使う。
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        """
+        amount個のトークンが使えるようになるまで待機する。
+        バケット容量を超える量は容量分たまった時点で払い出し、不足分は以降の待ち時間で返済する。
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                needed = min(amount, self.capacity)
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    return
+                wait = (needed - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _create_session():
+    """keep-alive接続プールと再試行設定を持つSessionを作成する"""
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+def get_session():
+    """全モジュールで共有するSessionを取得する（初回呼び出し時に作成）"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+
+def http_get(url, referer=None, stream=False, timeout=TIMEOUT, headers=None):
+    """共有Session経由でGETリクエストを送信する"""
+    request_headers = {}
+    if referer:
+        request_headers["Referer"] = referer
+    if headers:
+        request_headers.update(headers)
+    return get_session().get(url, headers=request_headers, stream=stream, timeout=timeout)
+
+
+def get_response_cache():
+    """共有のレスポンスキャッシュを取得する"""
+    return _response_cache
+
+
+def _response_from_cache(url, entry):
+    """キャッシュのエントリから200応答相当のResponseを組み立てる"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+    response._content = entry["body"]
+    response.from_cache = True
+    return response
+
+
+def cached_get(url, timeout=TIMEOUT, use_cache=True):
+    """
+    レスポンスキャッシュを使うGET。
+    キャッシュがあれば条件付きリクエストを送り、304なら保存済みの本文を返す。
+    use_cache=False（またはHTTP_CACHE_ENABLED=False）ならキャッシュを使わない。
+    """
+    if not (use_cache and HTTP_CACHE_ENABLED):
+        return http_get(url, timeout=timeout)
+
+    entry = _response_cache.load(url)
+    headers = _response_cache.conditional_headers(entry) if entry else None
+    response = http_get(url, timeout=timeout, headers=headers)
+
+    if response.status_code == 304 and entry:
+        response.close()
+        _response_cache.touch(url)
+        return _response_from_cache(url, entry)
+
+    if response.status_code == 200:
+        try:
+            _response_cache.store(url, response)
+        except OSError:
+            # キャッシュに書けなくても取得自体は成功として扱う
+            pass
+    response.from_cache = False
+    return response
+
+
+def close_session():
+    """共有Sessionを閉じ、保持している接続を解放する"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _normalize_encoding(name):
+    """Pythonで扱える文字コード名ならその正規名を、扱えなければNoneを返す"""
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.decode('ascii') if isinstance(name, bytes) else name).name
+    except (LookupError, UnicodeDecodeError):
+        return None
+
+
+def resolve_encoding(response):
+    """
+    レスポンス本文の文字コードを決定する。
+    Content-Typeヘッダー → <meta charset> → 同一ホストで解決済みの文字コード
+    → chardet（先頭ENCODING_DETECT_PREFIX_BYTESバイトのみ）の順に判定し、
+    結果をホストごとに記憶する。
+    """
+    host = urlsplit(response.url).netloc
+    content = response.content
+
+    match = _CONTENT_TYPE_CHARSET_RE.search(response.headers.get('Content-Type', ''))
+    encoding = _normalize_encoding(match.group(1)) if match else None
+
+    if encoding is None:
+        match = _META_CHARSET_RE.search(content[:_META_SCAN_BYTES])
+        encoding = _normalize_encoding(match.group(1)) if match else None
+
+    if encoding is None:
+        with _host_encodings_lock:
+            encoding = _host_encodings.get(host)
+        if encoding is not None:
+            return encoding
+
+    if encoding is None:
+        import chardet
+        detected = chardet.detect(content[:ENCODING_DETECT_PREFIX_BYTES])
+        if detected['encoding'] and detected['confidence'] > 0.7:
+            encoding = _normalize_encoding(detected['encoding'])
+        # 検出に失敗した場合はUTF-8を使用
+        encoding = encoding or 'utf-8'
+
+    with _host_encodings_lock:
+        _host_encodings[host] = encoding
+    return encoding
+
+
+def decode_response(response):
+    """resolve_encodingで決定した文字コードで本文をデコードして返す"""
+    response.encoding = resolve_encoding(response)
+    return response.text
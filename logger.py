@@ -1,22 +1,31 @@
 import os
+import sys
 import logging
+import threading
 from datetime import datetime
 from config import LOGS_DIR
 
+# メインロガー（ErinModManager）と同じログファイルに出力する各モジュールのロガー名
+MODULE_LOGGER_NAMES = ('RimWorldJapanizer', 'AutoJapanizer', 'TranslationChecker', 'TranslationScraper', 'BackupManager', 'CatalogDB')
+
 class ErinModManagerLogger:
     """統一されたログ管理クラス"""
     
     _instance = None
     _logger = None
+    _setup_lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
     
-    def __init__(self):
+    def _ensure_setup(self):
+        """初めてロガーが使われたときにログファイルを作成する（import時には何もしない）"""
         if self._logger is None:
-            self._setup_logger()
+            with self._setup_lock:
+                if self._logger is None:
+                    self._setup_logger()
     
     def _setup_logger(self):
         """ログ設定（起動時に一度だけ実行）"""
@@ -24,54 +33,65 @@ class ErinModManagerLogger:
         log_file = os.path.join(LOGS_DIR, f"ErinModManager_{datetime.now().strftime('%y.%m.%d_%H.%M.%S')}.log")
         
         # 既存のロガーをクリア
-        for logger_name in ['RimWorldJapanizer', 'AutoJapanizer', 'TranslationChecker', 'TranslationScraper', 'BackupManager']:
+        for logger_name in MODULE_LOGGER_NAMES:
             logger = logging.getLogger(logger_name)
             if logger.hasHandlers():
                 logger.handlers.clear()
         
         # メインロガーを設定
-        self._logger = logging.getLogger("ErinModManager")
-        if self._logger.hasHandlers():
-            self._logger.handlers.clear()
+        main_logger = logging.getLogger("ErinModManager")
+        if main_logger.hasHandlers():
+            main_logger.handlers.clear()
             
-        self._logger.setLevel(logging.INFO)
+        main_logger.setLevel(logging.INFO)
         handler = logging.FileHandler(log_file, encoding='utf-8')
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         handler.setFormatter(formatter)
-        self._logger.addHandler(handler)
+        main_logger.addHandler(handler)
         
         # 各モジュール用のロガーも同じファイルに出力
-        for logger_name in ['RimWorldJapanizer', 'AutoJapanizer', 'TranslationChecker', 'TranslationScraper', 'BackupManager']:
+        for logger_name in MODULE_LOGGER_NAMES:
             module_logger = logging.getLogger(logger_name)
             module_logger.setLevel(logging.INFO)
             module_logger.addHandler(handler)
             module_logger.propagate = False  # 重複出力を防ぐ
+        self._logger = main_logger
+    
+    def add_console_handler(self, level=logging.INFO):
+        """ログを標準エラー出力にも出す（CLI用）"""
+        self._ensure_setup()
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setLevel(level)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        for logger_name in ("ErinModManager",) + MODULE_LOGGER_NAMES:
+            logging.getLogger(logger_name).addHandler(handler)
     
     def get_logger(self, module_name="ErinModManager"):
         """指定されたモジュール名のロガーを取得"""
+        self._ensure_setup()
         return logging.getLogger(module_name)
     
     def info(self, message, module_name="ErinModManager"):
         """INFOレベルのログを出力"""
-        logger = logging.getLogger(module_name)
+        logger = self.get_logger(module_name)
         logger.info(message)
     
     def warning(self, message, module_name="ErinModManager"):
         """WARNINGレベルのログを出力"""
-        logger = logging.getLogger(module_name)
+        logger = self.get_logger(module_name)
         logger.warning(message)
     
     def error(self, message, module_name="ErinModManager"):
         """ERRORレベルのログを出力"""
-        logger = logging.getLogger(module_name)
+        logger = self.get_logger(module_name)
         logger.error(message)
     
     def debug(self, message, module_name="ErinModManager"):
         """DEBUGレベルのログを出力"""
-        logger = logging.getLogger(module_name)
+        logger = self.get_logger(module_name)
         logger.debug(message)
 
-# グローバルインスタンス
+# グローバルインスタンス（ログファイルは最初にロガーが使われたときに作成）
 logger_manager = ErinModManagerLogger()
 
 def get_logger(module_name="ErinModManager"):
@@ -0,0 +1,119 @@
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import MODS_DIR, LOCAL_MODS_DIR, LOGS_DIR, MOD_INVENTORY_CACHE_FILENAME, MOD_SCAN_WORKERS
+from utils import sanitize_filename, read_mod_metadata, atomic_open
+from logger import get_logger
+
+MOD_SOURCES = [("Workshop", MODS_DIR), ("Local", LOCAL_MODS_DIR)]
+
+_CACHE_VERSION = 2
+_cache_lock = threading.Lock()
+
+
+def _cache_path():
+    return os.path.join(LOGS_DIR, MOD_INVENTORY_CACHE_FILENAME)
+
+
+def _load_cache():
+    """永続キャッシュを読み込む（無い・形式が古い場合は空）"""
+    try:
+        with open(_cache_path(), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == _CACHE_VERSION:
+            return data.get('mods', {})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+
+def _save_cache(mods):
+    path = _cache_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with atomic_open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': _CACHE_VERSION, 'mods': mods}, f, ensure_ascii=False)
+
+
+def _about_mtime(mod_path):
+    """About/About.xmlのmtime_ns（無ければNone）"""
+    try:
+        return os.stat(os.path.join(mod_path, "About", "About.xml")).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _parse_record(mod_path, folder_mtime, about_mtime):
+    """キャッシュに保存する1MOD分のレコードを作る（About.xmlを解析）"""
+    metadata = read_mod_metadata(mod_path) if about_mtime is not None else {}
+    return {
+        'folder_mtime': folder_mtime,
+        'about_mtime': about_mtime,
+        'name': metadata.get('name'),
+        'package_id': metadata.get('package_id'),
+        'supported_versions': metadata.get('supported_versions', []),
+    }
+
+
+def scan_installed_mods(logger=None):
+    """
+    WorkshopとLocalのMODフォルダを走査し、MOD情報のリストを返す。
+    フォルダとAbout.xmlのmtimeが前回と同じMODはキャッシュ済みのメタデータを再利用し、
+    変更があったMODだけAbout.xmlをスレッドプールで並列に解析し直す。
+    戻り値: [{'mod_id', 'path', 'type', 'display_name', 'original_folder',
+              'package_id', 'supported_versions'}, ...]
+        display_nameはAbout.xmlに名前が無ければフォルダ名
+    """
+    logger = logger or get_logger("ErinModManager")
+    with _cache_lock:
+        cache = _load_cache()
+        new_cache = {}
+        found = []  # (mod_type, フォルダ名, パス)
+        stale = []  # 解析し直すMOD: (パス, フォルダmtime, About.xml mtime)
+
+        for mod_type, mod_dir in MOD_SOURCES:
+            if not os.path.isdir(mod_dir):
+                continue
+            with os.scandir(mod_dir) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        continue
+                    mod_path = entry.path
+                    folder_mtime = entry.stat().st_mtime_ns
+                    about_mtime = _about_mtime(mod_path)
+
+                    cached = cache.get(mod_path)
+                    if cached and cached['folder_mtime'] == folder_mtime and cached['about_mtime'] == about_mtime:
+                        new_cache[mod_path] = cached
+                    else:
+                        stale.append((mod_path, folder_mtime, about_mtime))
+                    found.append((mod_type, entry.name, mod_path))
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=MOD_SCAN_WORKERS) as executor:
+                for args, record in zip(stale, executor.map(lambda a: _parse_record(*a), stale)):
+                    new_cache[args[0]] = record
+        parsed_count = len(stale)
+
+        mods = []
+        for mod_type, folder_name, mod_path in found:
+            record = new_cache[mod_path]
+            mods.append({
+                'mod_id': sanitize_filename(folder_name),
+                'path': mod_path,
+                'type': mod_type,
+                'display_name': record['name'] or folder_name,
+                'original_folder': folder_name,
+                'package_id': record['package_id'],
+                'supported_versions': record['supported_versions'],
+            })
+
+        if new_cache != cache:
+            try:
+                _save_cache(new_cache)
+            except OSError as e:
+                logger.warning(f"MODインベントリキャッシュの保存に失敗: {e}")
+
+    logger.info(f"MODインベントリ: {len(mods)}件 (About.xml解析: {parsed_count}件, キャッシュ再利用: {len(mods) - parsed_count}件)")
+    return mods
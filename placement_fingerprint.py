@@ -0,0 +1,71 @@
+import os
+
+from config import JP_DIR_NAME
+from fingerprint import HASH_ALGORITHM, list_files, stat_digest, fingerprint_tree
+
+
+def _fingerprint_dir(jp_dir, files):
+    """
+    配置したJapaneseフォルダの指紋を作る。
+    stat: 相対パス・サイズ・mtimeのダイジェスト（安価な一次チェック用）
+    content: 相対パス・サイズ・内容の指紋（fingerprint.fingerprint_tree、statが一致しない場合の確認用）
+    """
+    return {
+        'algorithm': HASH_ALGORITHM,
+        'files': len(files),
+        'bytes': sum(size for _, size, _ in files),
+        'stat': stat_digest(files),
+        'content': fingerprint_tree(jp_dir, files=files)[0],
+    }
+
+
+def fingerprint_placement(mod_path, placement_locations):
+    """
+    MODに配置したJapaneseフォルダすべての指紋を作る。
+    配置場所はMODフォルダからの相対パスで保存する（ライブラリの移動に影響されない）。
+    戻り値: [{'languages_dir', 'algorithm', 'files', 'bytes', 'stat', 'content'}, ...]
+    """
+    placement = []
+    for languages_dir in placement_locations:
+        jp_dir = os.path.join(languages_dir, JP_DIR_NAME)
+        if not os.path.isdir(jp_dir):
+            continue
+        fingerprint = _fingerprint_dir(jp_dir, list_files(jp_dir))
+        fingerprint['languages_dir'] = os.path.relpath(languages_dir, mod_path).replace(os.sep, "/")
+        placement.append(fingerprint)
+    return placement
+
+
+def verify_placement(mod_path, placement):
+    """
+    保存した指紋と現在の配置を比べる。
+    まずstatレベル（ファイル数・サイズ・mtime）で比べ、一致しない場所だけ内容を読んで比べる。
+    別のハッシュ方式で保存された指紋は内容を比べられないため、ファイル数とサイズが一致すれば作り直す。
+    戻り値: (状態, 更新後の指紋)
+        状態: "ok" … 変化なし
+              "refreshed" … mtimeだけ変わっていて内容は同じ、または指紋を現在の方式で作り直した
+              "drifted" … Japaneseフォルダが消えた・内容が変わった
+    """
+    refreshed = False
+    new_placement = []
+    for saved in placement:
+        jp_dir = os.path.join(mod_path, *saved['languages_dir'].split("/"), JP_DIR_NAME)
+        if not os.path.isdir(jp_dir):
+            return "drifted", placement
+        try:
+            files = list_files(jp_dir)
+            if len(files) != saved['files'] or sum(size for _, size, _ in files) != saved['bytes']:
+                return "drifted", placement
+            if saved.get('algorithm') != HASH_ALGORITHM:
+                new_placement.append(dict(_fingerprint_dir(jp_dir, files), languages_dir=saved['languages_dir']))
+                refreshed = True
+                continue
+            stat = stat_digest(files)
+            if stat != saved['stat']:
+                if fingerprint_tree(jp_dir, files=files)[0] != saved.get('content'):
+                    return "drifted", placement
+                refreshed = True
+        except OSError:
+            return "drifted", placement
+        new_placement.append(dict(saved, stat=stat))
+    return ("refreshed" if refreshed else "ok"), new_placement
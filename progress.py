@@ -0,0 +1,41 @@
+"""
+コンソール用の進捗表示。
+GUIの進捗表示（pman）と同じメソッドを持ち、CLIやスクリプト単体での実行時に使う。
+"""
+import sys
+from datetime import datetime
+
+
+class ConsolePman:
+    """GUIの進捗表示（pman）の代わりに標準出力へ書き出す"""
+
+    def __init__(self, quiet=False):
+        self.quiet = quiet
+        self.error_count = 0
+        self._last_message = None
+
+    def _print(self, kind, message, stream=None):
+        stream = stream or sys.stdout
+        for line in str(message).splitlines() or [""]:
+            print(f"{datetime.now().strftime('%H:%M:%S')} [{kind}] {line}", file=stream, flush=True)
+
+    def set_status(self, message):
+        # 同じ内容の連続表示は省く
+        if not self.quiet and message != self._last_message:
+            self._last_message = message
+            self._print("状態", message)
+
+    def set_progress(self, message):
+        if not self.quiet and message != self._last_message:
+            self._last_message = message
+            self._print("進捗", message)
+
+    def popup_info(self, message):
+        self._print("情報", message)
+
+    def popup_warning(self, message):
+        self._print("警告", message, sys.stderr)
+
+    def popup_error(self, message):
+        self.error_count += 1
+        self._print("エラー", message, sys.stderr)
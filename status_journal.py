@@ -0,0 +1,112 @@
+import os
+import json
+import threading
+
+from config import LOGS_DIR, STATUS_JOURNAL_FILENAME, STATUS_JOURNAL_FSYNC_EVERY
+from logger import get_logger
+
+
+class StatusJournal:
+    """
+    適用状況の更新を追記専用のJSONLに記録するジャーナル。
+    MODごとにスナップショット（カタログDB + japanization_status.json）を書き直す代わりに、
+    1行追記するだけにする。追記ごとにOSへ書き出し、STATUS_JOURNAL_FSYNC_EVERY件ごとにまとめてfsyncする。
+    スナップショットへの反映（compact）は呼び出し側が起動時・一定件数ごとに行う。
+    """
+
+    def __init__(self, path=None, fsync_every=STATUS_JOURNAL_FSYNC_EVERY):
+        self.path = path or os.path.join(LOGS_DIR, STATUS_JOURNAL_FILENAME)
+        self.fsync_every = fsync_every
+        self.logger = get_logger("AutoJapanizer")
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        self._pending = {}  # スナップショット未反映の更新 {mod_id: entry}
+
+    def read_entries(self):
+        """
+        ジャーナルに残っている更新を読み込む（前回のクラッシュで残った分を含む）。
+        書き込み途中で切れた最終行は無視する。
+        """
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    entries[record['mod_id']] = record['entry']
+                except (ValueError, KeyError, TypeError):
+                    self.logger.warning(f"適用ジャーナルの壊れた行をスキップ: {self.path}:{line_number}")
+        return entries
+
+    def load(self):
+        """ディスク上のジャーナルを未反映の更新として読み込む"""
+        with self._lock:
+            self._pending = self.read_entries()
+            return dict(self._pending)
+
+    def append(self, mod_id, entry):
+        """更新を1行追記する。fsync_every件ごとにディスクへ同期する"""
+        line = json.dumps({'mod_id': mod_id, 'entry': entry}, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+            self._pending[mod_id] = entry
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every:
+                self._sync()
+
+    def pending(self):
+        """スナップショット未反映の更新"""
+        with self._lock:
+            return dict(self._pending)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """未同期の追記分をディスクへ同期する"""
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def compact(self, write_snapshot):
+        """
+        未反映の更新をwrite_snapshot(更新の辞書)でスナップショットへ書き込み、ジャーナルを空にする。
+        スナップショットの書き込みに失敗した場合はジャーナルを残す。
+        戻り値: 反映した件数
+        """
+        with self._lock:
+            self._sync()
+            if not self._pending:
+                return 0
+            write_snapshot(dict(self._pending))
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            count = len(self._pending)
+            self._pending = {}
+            return count
+
+    def close(self):
+        with self._lock:
+            self._sync()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
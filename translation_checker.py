@@ -1,14 +1,13 @@
 import os
 import csv
-import requests
-from bs4 import BeautifulSoup
 
-from config import LOGS_DIR, CSV_FILENAME, CSV_ENCODING
-from translation_scraper import format_mod_update_date
+from config import LOGS_DIR, CSV_FILENAME, CSV_ENCODING, INCREMENTAL_SYNC_MAX_PAGES
+from translation_scraper import format_mod_update_date, URL_FMT
+from http_client import cached_get, decode_response
+from uploader_parser import parse_uploader_rows
+from catalog_db import CatalogDB
 from logger import get_logger
 
-import chardet
-
 
 class TranslationChecker:
     """最新翻訳チェック機能を管理するクラス"""
@@ -28,14 +27,22 @@ class TranslationChecker:
             csv_exists = os.path.exists(self.csv_file)
             
             if csv_exists:
-                with open(self.csv_file, 'r', encoding=CSV_ENCODING) as f:
-                    reader = csv.DictReader(f)
-                    existing_file_ids = {row['File ID'] for row in reader}
+                with CatalogDB(csv_path=self.csv_file) as catalog:
+                    catalog.sync_from_csv()
+                    existing_file_ids = catalog.get_file_ids()
                 self.pman.set_progress(f"既存のCSVファイルから {len(existing_file_ids)} 件のFile IDを読み込み")
                 
-                # CSVが存在する場合：0ページ目のみチェック（効率的）
+                # CSVが存在する場合：既知のFile IDだけのページに達するまで遡る（差分同期）
                 self.pman.set_status("ウェブサイトの最新投稿をチェック中...")
-                new_translations = self._get_latest_translations()
+                new_translations, reached_known = self._get_new_translations(existing_file_ids)
+                
+                if not reached_known:
+                    # 取得済みの分だけ追記すると、上限ページと既知の投稿の間が欠けたまま
+                    # 次回以降の差分同期も新しい先頭で止まってしまうため、追記せずに全ページを取り直す
+                    self.logger.warning(f"{INCREMENTAL_SYNC_MAX_PAGES}ページ遡っても既知の投稿に到達しませんでした。全ページを取得し直します")
+                    self.pman.set_status(f"{INCREMENTAL_SYNC_MAX_PAGES}ページ遡っても既知の投稿に到達しなかったため、全翻訳リストを取得し直します...")
+                    self._scrape_full_list("翻訳リストの再取得が完了しました。")
+                    return
                 
                 if not new_translations:
                     self.pman.popup_info("最新の翻訳投稿が見つかりませんでした。")
@@ -59,82 +66,90 @@ class TranslationChecker:
             else:
                 # CSVが存在しない場合：全ページを取得（新規作成）
                 self.pman.set_status("CSVファイルが存在しないため、全翻訳リストを取得します...")
-                from translation_scraper import scrape_and_save_to_csv
-                scrape_and_save_to_csv(self.pman)
-                self.pman.popup_info("翻訳リストの新規作成が完了しました。\n「一括日本語ファイル適用」ボタンで適用できます。")
+                self._scrape_full_list("翻訳リストの新規作成が完了しました。")
             
         except Exception as e:
             self.pman.set_status("最新翻訳チェック失敗")
             self.pman.popup_error(f"最新翻訳チェック中にエラーが発生しました。\n{e}")
     
-    def _get_latest_translations(self):
-        """ウェブサイトの最新投稿（0ページ目）を取得"""
-        url = "https://rimworld.2game.info/uploader_translation.php?id=&page=0"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        try:
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            # 文字コードを自動検出
-            detected_encoding = chardet.detect(response.content)
-            if detected_encoding['encoding'] and detected_encoding['confidence'] > 0.7:
-                response.encoding = detected_encoding['encoding']
-            else:
-                response.encoding = 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            table = soup.find('table', class_='uploaderTable')
-            
-            if not table or not table.tbody:
-                return []
+    def _scrape_full_list(self, done_message):
+        """全ページを取得して翻訳リストを作り直す（完了するまで既存のCSVは置き換えない）"""
+        from translation_scraper import scrape_and_save_to_csv
+        if scrape_and_save_to_csv(self.pman):
+            self.pman.popup_info(f"{done_message}\n「一括日本語ファイル適用」ボタンで適用できます。")
+        else:
+            self.pman.popup_warning("翻訳リストの取得が途中で中断されました。\n再度実行すると続きから再開します。")
+    
+    def _get_new_translations(self, existing_file_ids):
+        """
+        0ページ目から順に遡り、全行が既知のFile IDであるページに達した時点で停止する。
+        途中のページの取得に失敗した場合は例外を送出する（取得済みの分だけCSVに追記すると、
+        次回は0ページ目が既知となり、失敗したページ以降の投稿を取りこぼすため）。
+        戻り値: (取得した翻訳のリスト, 既知のページに到達したか)
+        """
+        translations = []
+        for page_number in range(INCREMENTAL_SYNC_MAX_PAGES):
+            self.pman.set_status(f"ウェブサイトの最新投稿をチェック中... (ページ {page_number + 1})")
+            try:
+                page_translations = self._get_latest_translations(page_number)
+            except Exception as e:
+                self.logger.error(f"差分同期: ページ {page_number + 1} の取得に失敗したため中止します - {e}")
+                raise RuntimeError(f"ページ {page_number + 1} の取得に失敗しました。CSVへの追加は行っていません。\n{e}") from e
+            if not page_translations:
+                # 空ページ（最終ページ）
+                self.logger.info(f"差分同期: ページ {page_number + 1} にデータがないため終了")
+                return translations, True
             
-            rows = table.tbody.find_all('tr')
-            translations = []
+            translations.extend(page_translations)
+            if all(t['File ID'] in existing_file_ids for t in page_translations):
+                self.logger.info(f"差分同期: ページ {page_number + 1} は全て登録済み、{page_number + 1}ページで終了")
+                return translations, True
+        
+        return translations, False
+    
+    def _get_latest_translations(self, page_number=0):
+        """
+        ウェブサイトの投稿一覧（指定ページ、既定は最新の0ページ目）を取得。
+        取得・解析に失敗した場合は例外を送出する（空リストは最終ページを意味する）。
+        """
+        url = URL_FMT.format(page_number)
+        
+        response = cached_get(url)
+        response.raise_for_status()
+        
+        rows = parse_uploader_rows(decode_response(response))
+        translations = []
+        
+        for i, row in enumerate(rows):
+            file_id = row['file_id']
             
-            for i, row in enumerate(rows):
-                cells = row.find_all('td')
-                if len(cells) >= 6:
-                    file_id = cells[0].text.strip()
-                    if not file_id:
-                        continue
-                    
-                    # 進捗表示
-                    self.pman.set_progress(f"翻訳データを解析中... ({i+1}/{len(rows)}) File ID: {file_id}")
-                    
-                    mod_cell = cells[1]
-                    mod_id = mod_cell.text.strip()
-                    mod_name = mod_cell.find('a', title=True)['title'].strip() if mod_cell.find('a', title=True) else ""
-                    
-                    mod_update_text = cells[2].text.strip()
-                    jp_upload_date = cells[4].text.strip()
-                    size = cells[5].text.strip()
-                    
-                    # 日付フォーマット
-                    mod_update_date_formatted = format_mod_update_date(mod_update_text, jp_upload_date)
-                    
-                    translations.append({
-                        'File ID': file_id,
-                        'MOD ID': mod_id,
-                        'MOD Name': mod_name,
-                        'Mod-Update-Date': mod_update_date_formatted,
-                        'JP-File-Upload-Date': jp_upload_date,
-                        'Size': size
-                    })
+            # 進捗表示
+            self.pman.set_progress(f"翻訳データを解析中... (ページ {page_number + 1}: {i+1}/{len(rows)}) File ID: {file_id}")
             
-            return translations
+            # 日付フォーマット
+            mod_update_date_formatted = format_mod_update_date(row['mod_update_text'], row['jp_upload_date'])
             
-        except Exception as e:
-            self.pman.popup_error(f"最新投稿の取得に失敗しました。\n{e}")
-            return []
+            translations.append({
+                'File ID': file_id,
+                'MOD ID': row['mod_id'],
+                'MOD Name': row['mod_name'],
+                'Mod-Update-Date': mod_update_date_formatted,
+                'JP-File-Upload-Date': row['jp_upload_date'],
+                'Size': row['size']
+            })
+        
+        return translations
 
     
     def _append_to_csv(self, new_translations, added_file_ids):
         """新しい翻訳をCSVファイルに追加"""
-        # 追加する翻訳のみをフィルタリング
-        translations_to_add = [t for t in new_translations if t['File ID'] in added_file_ids]
+        # 追加する翻訳のみをフィルタリング（ページ送り中の投稿でずれた重複行は除く）
+        translations_to_add = []
+        seen_file_ids = set()
+        for t in new_translations:
+            if t['File ID'] in added_file_ids and t['File ID'] not in seen_file_ids:
+                translations_to_add.append(t)
+                seen_file_ids.add(t['File ID'])
         
         # CSVファイルに追加
         with open(self.csv_file, 'a', newline='', encoding=CSV_ENCODING) as csvfile:
@@ -149,6 +164,11 @@ class TranslationChecker:
                     translation['JP-File-Upload-Date'],
                     translation['Size']
                 ])
+        
+        # カタログにも追加し、追記したCSVの再取り込みを省く
+        with CatalogDB(csv_path=self.csv_file) as catalog:
+            catalog.add_translations(translations_to_add)
+            catalog.mark_csv_synced()
     
     def _check_applicable_translations(self, new_translations, added_file_ids):
         """追加された翻訳のうち適用可能なものをチェック"""
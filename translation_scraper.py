@@ -1,24 +1,23 @@
 import requests
-from bs4 import BeautifulSoup
-import time
 import os
 import csv
-import sys
+import json
 import re
-from datetime import datetime
-
-import chardet
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
 # --- 設定 ---
-from config import LOGS_DIR, CSV_FILENAME, CSV_ENCODING
+from config import LOGS_DIR, CSV_FILENAME, CSV_ENCODING, CSV_HEADER, SCRAPE_MAX_WORKERS, SCRAPE_REQUESTS_PER_SECOND, SCRAPE_CHECKPOINT_MAX_AGE_HOURS
+from http_client import RateLimiter, cached_get, decode_response
+from uploader_parser import parse_uploader_rows
+from utils import atomic_open, remove_quietly
+from progress import ConsolePman
 from logger import get_logger
 
 URL_FMT = "https://rimworld.2game.info/uploader_translation.php?id=&page={}"
 OUTPUT_DIR = LOGS_DIR
 # OUTPUT_FILENAMEはconfig.pyのCSV_FILENAMEを使用
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-}
+# User-Agent等の共通ヘッダーはhttp_client.pyで設定
 TIMEOUT = 300
 
 # --- ヘルパー関数 ---
@@ -54,123 +53,185 @@ def format_mod_update_date(mod_update_str, jp_upload_str):
     except (ValueError, AttributeError, TypeError):
         return mod_update_str
 
+# --- 並列取得 ---
+
+def _fetch_page_rows(page_number, limiter, use_cache=True):
+    """
+    1ページ分を取得して解析し、CSV行のリストを返す。
+    データ行が無い場合は空リストを返す（最終ページ）。
+    """
+    limiter.acquire()
+    url = URL_FMT.format(page_number)
+    response = cached_get(url, timeout=TIMEOUT, use_cache=use_cache)
+    response.raise_for_status()
+
+    csv_rows = []
+    for row in parse_uploader_rows(decode_response(response)):
+        mod_id = sanitize_text(row['mod_id'])
+        mod_name = sanitize_text(row['mod_name'])
+        mod_update_text = sanitize_text(row['mod_update_text'])
+        jp_upload_date = sanitize_text(row['jp_upload_date'])
+        size = sanitize_text(row['size'])
+
+        mod_update_date_formatted = format_mod_update_date(mod_update_text, jp_upload_date)
+
+        csv_rows.append([
+            page_number + 1, row['file_id'], mod_id, mod_name,
+            mod_update_date_formatted, jp_upload_date, size
+        ])
+    return csv_rows
+
+# --- チェックポイント ---
+
+def _load_checkpoint(checkpoint_path, temp_filepath, logger=None):
+    """
+    前回中断時のチェックポイントを読み込む。
+    一時CSVが存在し、記録されたサイズ以上あり、保存からSCRAPE_CHECKPOINT_MAX_AGE_HOURS以内の場合のみ有効とする。
+    """
+    if not os.path.exists(checkpoint_path) or not os.path.exists(temp_filepath):
+        return None
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if os.path.getsize(temp_filepath) < checkpoint['file_size']:
+            return None
+        age = datetime.now() - datetime.fromisoformat(checkpoint['saved_at'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if age > timedelta(hours=SCRAPE_CHECKPOINT_MAX_AGE_HOURS):
+        if logger:
+            logger.info(f"チェックポイントが古いため破棄し、最初から取得します (保存: {checkpoint['saved_at']})")
+        return None
+    return checkpoint
+
+
+def _save_checkpoint(checkpoint_path, last_completed_page, file_size, processed_count):
+    """完了したページまでの状態を原子的に保存する"""
+    checkpoint = {
+        'last_completed_page': last_completed_page,
+        'file_size': file_size,
+        'processed_count': processed_count,
+        'saved_at': datetime.now().isoformat(),
+    }
+    with atomic_open(checkpoint_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+
+
 # --- メイン処理 ---
 
-def scrape_and_save_to_csv(pman=None):
+def scrape_and_save_to_csv(pman=None, max_workers=SCRAPE_MAX_WORKERS, requests_per_second=SCRAPE_REQUESTS_PER_SECOND, use_cache=True, resume=True):
     """
     サイトの全ページを巡回し、MOD情報を取得してCSVファイルに保存します。
-    現在の処理状況をコンソールに詳細表示します。
+    複数ページを並列に取得しつつ、CSVにはページ順で書き込みます。
+    最初の空ページで取得を打ち切ります。
+    use_cache=Falseの場合はHTTPレスポンスキャッシュを使わずに全ページを取り直します。
+
+    取得中は一時ファイルに書き込み、最終ページまで完了した時点で本来のCSVと置き換えます。
+    中断・エラー時は完了したページをチェックポイントに記録し、次回（resume=True）はその続きから再開します。
+    進捗はpmanに通知する（pmanを省略した場合は標準出力に表示する）。
+    戻り値: 最終ページまで取得できた場合True
     """
     logger = get_logger("TranslationScraper")
+    if pman is None:
+        pman = ConsolePman()
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     output_filepath = os.path.join(OUTPUT_DIR, CSV_FILENAME)
-
-    logger.info("翻訳リスト取得開始")
-    if pman:
-        pman.set_progress("データの取得を開始します...")
+    temp_filepath = output_filepath + '.partial'
+    checkpoint_path = output_filepath + '.checkpoint.json'
+
+    logger.info(f"翻訳リスト取得開始 (並列数: {max_workers}, 上限: {requests_per_second}リクエスト/秒, 出力先: {os.path.abspath(output_filepath)})")
+    pman.set_progress("データの取得を開始します...")
+
+    checkpoint = _load_checkpoint(checkpoint_path, temp_filepath, logger) if resume else None
+    if checkpoint:
+        # 最後に完了したページより後に書かれた（不完全な）行を切り捨てて再開する
+        with open(temp_filepath, 'r+b') as f:
+            f.truncate(checkpoint['file_size'])
+        start_page = checkpoint['last_completed_page'] + 1
+        processed_count = checkpoint['processed_count']
+        with open(temp_filepath, 'r', newline='', encoding=CSV_ENCODING) as f:
+            written_file_ids = {row['File ID'] for row in csv.DictReader(f)}
+        resume_info = f"前回の続き（ページ {start_page + 1}）から再開します"
+        logger.info(f"{resume_info} (取得済み: {processed_count}件)")
+        pman.set_progress(resume_info)
     else:
-        print(f"データの取得を開始します...")
-    print(f"出力ファイル: {os.path.abspath(output_filepath)}")
-
-    processed_count = 0
-    scanned_pages = 0
+        start_page = 0
+        processed_count = 0
+        written_file_ids = set()
+        remove_quietly(checkpoint_path)
+
+    scanned_pages = start_page
+    completed = False
+    limiter = RateLimiter(requests_per_second)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
     try:
-        with open(output_filepath, 'w', newline='', encoding=CSV_ENCODING) as csvfile:
+        with open(temp_filepath, 'a' if checkpoint else 'w', newline='', encoding=CSV_ENCODING) as csvfile:
             csv_writer = csv.writer(csvfile)
             
-            header = ["Page Number", "File ID", "MOD ID", "MOD Name", "Mod-Update-Date", "JP-File-Upload-Date", "Size"]
-            csv_writer.writerow(header)
-            
-            page_number = 0
+            if not checkpoint:
+                csv_writer.writerow(CSV_HEADER)
+
+            # 先読みするページをmax_workers件だけ投入しておき、1件書き込むごとに次を補充する
+            pending = {}
+            next_page_to_submit = start_page
+            for _ in range(max_workers):
+                pending[next_page_to_submit] = executor.submit(_fetch_page_rows, next_page_to_submit, limiter, use_cache)
+                next_page_to_submit += 1
+
+            page_number = start_page
             while True:
-                url = URL_FMT.format(page_number)
-                sys.stdout.write(f"\r{' ' * 100}\r")
-                page_info = f"ページ {page_number + 1} の処理を開始"
-                print(f"--- {page_info} ({url}) ---")
-                if pman:
-                    pman.set_progress(page_info)
-                scanned_pages = page_number + 1
+                pman.set_progress(f"ページ {page_number + 1} の処理を開始")
 
                 try:
-                    response = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-                    response.raise_for_status()
-                    
-                    # 文字コードを自動検出して設定
-                    detected_encoding = chardet.detect(response.content)
-                    if detected_encoding['encoding'] and detected_encoding['confidence'] > 0.7:
-                        response.encoding = detected_encoding['encoding']
-                        print(f"  文字コードを検出: {detected_encoding['encoding']} (信頼度: {detected_encoding['confidence']:.2f})")
-                    else:
-                        # 検出に失敗した場合はUTF-8を試す
-                        response.encoding = 'utf-8'
-                        print(f"  文字コード検出失敗、UTF-8を使用")
-                        
+                    csv_rows = pending.pop(page_number).result()
                 except requests.exceptions.RequestException as e:
-                    print(f"\nエラー: ページ {page_number + 1} の取得に失敗しました: {e}", file=sys.stderr)
+                    logger.error(f"ページ {page_number + 1} の取得に失敗: {e}")
+                    pman.set_status(f"ページ {page_number + 1} の取得に失敗しました: {e}")
                     break
+                scanned_pages = page_number + 1
 
-                soup = BeautifulSoup(response.text, 'html.parser')
-                table = soup.find('table', class_='uploaderTable')
-
-                if not table or not table.tbody:
-                    print(f"ページ {page_number + 1} にデータテーブルが見つかりませんでした。最終ページと判断し、処理を終了します。")
+                if not csv_rows:
+                    pman.set_progress(f"ページ {page_number + 1} で有効なデータが検出されませんでした。最終ページと判断し、処理を終了します。")
+                    completed = True
                     break
 
-                rows = table.tbody.find_all('tr')
-                if not rows:
-                    print(f"ページ {page_number + 1} にデータ行が見つかりませんでした。最終ページと判断し、処理を終了します。")
-                    break
+                # 再開時、ページのずれで前回書き込み済みの行が再度現れた場合は除外する
+                new_rows = [row for row in csv_rows if row[1] not in written_file_ids]
+                csv_writer.writerows(new_rows)
+                written_file_ids.update(row[1] for row in new_rows)
+                processed_count += len(new_rows)
 
-                is_data_found_on_page = False
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 6:
-                        file_id = cells[0].text.strip()
-                        if not file_id:
-                            continue
-
-                        is_data_found_on_page = True
-                        file_info = f"File ID: {file_id} を処理中"
-                        print(f"  - {file_info}...")
-                        if pman:
-                            pman.set_progress(f"ページ {page_number + 1} - {file_info}")
-
-                        mod_cell = cells[1]
-                        mod_id = sanitize_text(mod_cell.text.strip())
-                        mod_name = sanitize_text(mod_cell.find('a', title=True)['title'].strip() if mod_cell.find('a', title=True) else "")
-                        
-                        mod_update_text = sanitize_text(cells[2].text.strip())
-                        jp_upload_date = sanitize_text(cells[4].text.strip())
-                        size = sanitize_text(cells[5].text.strip())
-                        
-                        mod_update_date_formatted = format_mod_update_date(mod_update_text, jp_upload_date)
-                        
-                        csv_writer.writerow([
-                            page_number + 1, file_id, mod_id, mod_name, 
-                            mod_update_date_formatted, jp_upload_date, size
-                        ])
-                        processed_count += 1
-                
-                if not is_data_found_on_page:
-                    print(f"ページ {page_number + 1} で有効なデータが検出されませんでした。処理を終了します。")
-                    break
+                csvfile.flush()
+                os.fsync(csvfile.fileno())
+                _save_checkpoint(checkpoint_path, page_number, os.fstat(csvfile.fileno()).st_size, processed_count)
+
+                pman.set_progress(f"ページ {page_number + 1} - {len(new_rows)} 件を書き込みました（{processed_count} 件取得済み）")
 
+                pending[next_page_to_submit] = executor.submit(_fetch_page_rows, next_page_to_submit, limiter, use_cache)
+                next_page_to_submit += 1
                 page_number += 1
-                time.sleep(0.5)
+
+        if completed:
+            os.replace(temp_filepath, output_filepath)
+            remove_quietly(checkpoint_path)
 
     except (KeyboardInterrupt, SystemExit):
-        print("\n\n処理がユーザーによって中断されました。")
+        pman.set_status("処理がユーザーによって中断されました。")
     except Exception as e:
-        print(f"\n予期せぬエラーが発生しました: {e}", file=sys.stderr)
+        logger.error(f"翻訳リスト取得中にエラー: {e}")
+        pman.set_status(f"予期せぬエラーが発生しました: {e}")
     finally:
-        completion_info = f"処理完了 - スキャン: {scanned_pages}ページ, 取得: {processed_count}件"
-        logger.info(f"翻訳リスト取得完了: {scanned_pages}ページ, {processed_count}件")
-        print(f"\n--- 処理完了 ---")
-        print(f"スキャンした総ページ数: {scanned_pages} ページ")
-        print(f"取得した総データ件数: {processed_count} 件")
-        print(f"データは {os.path.abspath(output_filepath)} に保存されました。")
-        if pman:
-            pman.set_progress(completion_info)
+        # 最終ページ以降の先読み分は破棄する
+        executor.shutdown(wait=False, cancel_futures=True)
+        if completed:
+            completion_info = f"処理完了 - スキャン: {scanned_pages}ページ, 取得: {processed_count}件"
+            logger.info(f"翻訳リスト取得完了: {scanned_pages}ページ, {processed_count}件")
+        else:
+            completion_info = f"処理中断 - 取得済み: {processed_count}件（次回はページ {scanned_pages + 1} から再開）"
+            logger.warning(f"翻訳リスト取得中断: {scanned_pages}ページまで, {processed_count}件")
+        pman.set_progress(completion_info)
+
+    return completed
 
 if __name__ == '__main__':
     scrape_and_save_to_csv()
\ No newline at end of file
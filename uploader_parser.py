@@ -0,0 +1,406 @@
+"""
+uploader_translation.php の一覧テーブル（uploaderTable）から行データを取り出す。
+
+どちらの実装もBeautifulSoup(html.parser)で
+    table.uploaderTable > tbody（最初のもの）> tr（子孫すべて）> td（子孫すべて）
+を辿った場合と同じ結果を返す。
+BeautifulSoup(html.parser)は閉じタグの省略を補完しない（閉じられていないtdは次のtdを子に持ち、
+終了タグは同名の直近の開始タグまでを閉じる）ため、崩れた行でも同じ木を組み立てて同じ結果にする。
+
+lxmlがインストールされていて、かつ対象テーブルのタグが正しく対応している場合はlxmlで解析する
+（この場合はlxmlとBeautifulSoupの木が一致する）。それ以外は標準ライブラリの
+html.parser.HTMLParser で対象テーブルの部分木だけを組み立てる。
+"""
+import os
+import re
+from html.parser import HTMLParser
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+TABLE_CLASS = "uploaderTable"
+MIN_CELLS = 6
+# ベンチマーク・出力比較用の保存済みページ（閉じタグの省略・入れ子テーブル等の崩れた行を含むものもある）
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 終了タグを持たない要素（BeautifulSoupのHTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGSと同じ）
+_VOID_ELEMENTS = frozenset((
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame', 'hr', 'image', 'img',
+    'input', 'isindex', 'keygen', 'link', 'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer', 'track', 'wbr',
+))
+# この中の文字列はBeautifulSoupの.textに含まれない（DEFAULT_STRING_CONTAINERS）
+_STRING_CONTAINERS = frozenset(('rt', 'rp', 'style', 'script', 'template'))
+# この中では空白だけの文字列を縮めない（preserve_whitespace_tags）
+_PRESERVE_WHITESPACE = frozenset(('pre', 'textarea'))
+_ASCII_SPACES = frozenset('\x20\x0a\x09\x0c\x0d')
+
+
+def _collapse_whitespace(text):
+    """BeautifulSoupと同じく、空白だけの文字列は改行を含めば"\\n"、含まなければ" "にする"""
+    if text and all(c in _ASCII_SPACES for c in text):
+        return "\n" if "\n" in text else " "
+    return text
+
+
+def _make_row(cell_texts, mod_name):
+    """セルのテキストから行データの辞書を作る（列数が足りない・File IDが空ならNone）"""
+    if len(cell_texts) < MIN_CELLS:
+        return None
+    file_id = cell_texts[0].strip()
+    if not file_id:
+        return None
+    return {
+        'file_id': file_id,
+        'mod_id': cell_texts[1].strip(),
+        'mod_name': (mod_name or "").strip(),
+        'mod_update_text': cell_texts[2].strip(),
+        'jp_upload_date': cell_texts[4].strip(),
+        'size': cell_texts[5].strip(),
+    }
+
+
+def _has_table_class(class_value):
+    return class_value is not None and TABLE_CLASS in class_value.split()
+
+
+class _Element:
+    """対象テーブル以下の要素（タグ名・title属性・子要素と文字列）"""
+    __slots__ = ("name", "title", "children")
+
+    def __init__(self, name, title=None):
+        self.name = name
+        self.title = title
+        self.children = []
+
+
+def _descendants(element, name):
+    """nameの子孫要素を文書順に返す"""
+    found = []
+    stack = [iter(element.children)]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+        elif isinstance(child, _Element):
+            if child.name == name:
+                found.append(child)
+            stack.append(iter(child.children))
+    return found
+
+
+def _text(element):
+    """子孫の文字列を連結する（BeautifulSoupの.text相当）"""
+    parts = []
+    stack = [iter(element.children)]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+        elif isinstance(child, _Element):
+            stack.append(iter(child.children))
+        else:
+            parts.append(child)
+    return "".join(parts)
+
+
+class _StopParsing(Exception):
+    pass
+
+
+class _UploaderTableBuilder(HTMLParser):
+    """
+    BeautifulSoup(html.parser)と同じ規則で文書を読み、最初のuploaderTableの部分木だけを組み立てる。
+    開始タグは何も閉じず、終了タグは同名の直近の開いている要素までを閉じる（無ければ無視）。
+    対象テーブルが閉じた時点で解析を打ち切る。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.table = None
+        self._open_tags = []       # 文書全体で開いている要素のタグ名
+        self._table_level = None   # 対象テーブルの_open_tags上の位置
+        self._nodes = []           # 対象テーブル以下で開いている要素（_open_tags[_table_level:]に対応）
+        self._containers = 0       # 対象テーブル以下で開いているscript/style等の数
+        self._preserving = 0       # 対象テーブル以下で開いているpre等の数
+        self._pending = []         # 次のタグまでの文字列の断片
+
+    def _flush(self):
+        # タグ・コメントで区切られた文字列を1つの文字列として現在の要素に加える
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending = []
+        if self.table is None or self._containers:
+            return
+        if not self._preserving:
+            text = _collapse_whitespace(text)
+        self._nodes[-1].children.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in _VOID_ELEMENTS:
+            return
+        self._open_tags.append(tag)
+        if self.table is None:
+            if tag == "table" and _has_table_class(self._attr(attrs, "class")):
+                self.table = _Element(tag)
+                self._table_level = len(self._open_tags) - 1
+                self._nodes = [self.table]
+            return
+        element = _Element(tag, self._attr(attrs, "title") if tag == "a" else None)
+        self._nodes[-1].children.append(element)
+        self._nodes.append(element)
+        if tag in _STRING_CONTAINERS:
+            self._containers += 1
+        if tag in _PRESERVE_WHITESPACE:
+            self._preserving += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in _VOID_ELEMENTS:
+            return
+        for level in range(len(self._open_tags) - 1, -1, -1):
+            if self._open_tags[level] == tag:
+                break
+        else:
+            return
+        del self._open_tags[level:]
+        if self.table is None:
+            return
+        if level <= self._table_level:
+            raise _StopParsing()
+        for element in self._nodes[level - self._table_level:]:
+            if element.name in _STRING_CONTAINERS:
+                self._containers -= 1
+            if element.name in _PRESERVE_WHITESPACE:
+                self._preserving -= 1
+        del self._nodes[level - self._table_level:]
+
+    def handle_data(self, data):
+        self._pending.append(data)
+
+    def unknown_decl(self, data):
+        # <![CDATA[...]]> の中身は独立した文字列として扱われる
+        self._flush()
+        if data.upper().startswith("CDATA["):
+            self._pending.append(data[len("CDATA["):])
+            self._flush()
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    @staticmethod
+    def _attr(attrs, name, default=None):
+        value = default
+        for key, attr_value in attrs:
+            if key == name:  # 重複した属性は後のものが有効
+                value = attr_value if attr_value is not None else ""
+        return value
+
+
+def _rows_from_table(table):
+    tbodies = _descendants(table, "tbody")
+    if not tbodies:
+        return []
+    rows = []
+    for tr in _descendants(tbodies[0], "tr"):
+        tds = _descendants(tr, "td")
+        if len(tds) < MIN_CELLS:
+            continue
+        titled = [a for a in _descendants(tds[1], "a") if a.title is not None]
+        row = _make_row([_text(td) for td in tds], titled[0].title if titled else None)
+        if row:
+            rows.append(row)
+    return rows
+
+
+def _parse_with_html_parser(html):
+    builder = _UploaderTableBuilder()
+    try:
+        builder.feed(html)
+        builder.close()
+        builder._flush()
+    except _StopParsing:
+        pass
+    if builder.table is None:
+        return []
+    return _rows_from_table(builder.table)
+
+
+_TABLE_START_RE = re.compile(r"<table\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*>", re.IGNORECASE)
+_CLASS_ATTR_RE = re.compile(r"""\sclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+))""", re.IGNORECASE)
+_TAG_RE = re.compile(r"<(/?)([a-zA-Z][^\s/>]*)([^>\"']*(?:(?:\"[^\"]*\"|'[^']*')[^>\"']*)*)>|<!|\r")
+# テーブルの構造要素と、その親になれる要素（lxmlは親が違う構造要素を組み替える）
+_TABLE_PARENTS = {
+    'table': ('td', 'th'),
+    'thead': ('table',), 'tbody': ('table',), 'tfoot': ('table',),
+    'tr': ('table', 'thead', 'tbody', 'tfoot'),
+    'td': ('tr',), 'th': ('tr',),
+}
+# セル内でlxmlが閉じタグを補ったり組み替えたりしない要素（これ以外を含む場合はhtml.parserで解析する）
+_INLINE_SAFE = frozenset((
+    'a', 'abbr', 'b', 'big', 'br', 'code', 'div', 'em', 'font', 'i', 'img', 'label', 'nobr', 's', 'small',
+    'span', 'strike', 'strong', 'sub', 'sup', 'tt', 'u', 'wbr',
+))
+
+
+def _is_well_formed_table(html):
+    """
+    最初のuploaderTableの開始タグから対応する終了タグまで、タグが入れ子どおりに閉じられ、
+    テーブルの構造要素が正しい親の下にあり、それ以外の要素が_INLINE_SAFEのものだけか。
+    この場合に限り、lxmlの木とBeautifulSoup(html.parser)の木が一致する。
+    コメント・CDATA・CR・<div/>のような自己終了タグを含む場合もFalse。
+    """
+    for match in _TABLE_START_RE.finditer(html):
+        class_match = _CLASS_ATTR_RE.search(match.group(0))
+        if class_match and _has_table_class(next(g for g in class_match.groups() if g is not None)):
+            start = match.start()
+            break
+    else:
+        return False
+
+    open_tags = []
+    for closing, name, rest in _TAG_RE.findall(html, start):
+        if not name:
+            return False  # <!-- / <![CDATA[ / <!DOCTYPE / CR
+        name = name.lower()
+        if closing:
+            if name in _VOID_ELEMENTS or not open_tags or open_tags.pop() != name:
+                return False
+            if not open_tags:
+                return True
+            continue
+        if rest.endswith("/"):
+            return False  # <div/> はhtml.parserでは空要素、lxmlでは開始タグになる
+        parent = open_tags[-1] if open_tags else None
+        if name in _TABLE_PARENTS:
+            if parent is not None and parent not in _TABLE_PARENTS[name]:
+                return False
+        elif name not in _INLINE_SAFE or parent not in ('td', 'th') and parent not in _INLINE_SAFE:
+            return False
+        elif name == 'a' and 'a' in open_tags:
+            return False  # 入れ子のaはlxmlが閉じる
+        if name not in _VOID_ELEMENTS:
+            open_tags.append(name)
+    return False
+
+
+_TABLE_XPATH = "//table[contains(concat(' ', normalize-space(@class), ' '), ' %s ')]" % TABLE_CLASS
+
+
+def _parse_with_lxml(html):
+    doc = lxml.html.fromstring(html)
+    tables = doc.xpath(_TABLE_XPATH)
+    if not tables:
+        return []
+    tbodies = tables[0].xpath(".//tbody")
+    if not tbodies:
+        return []
+
+    rows = []
+    for tr in tbodies[0].iter("tr"):
+        tds = list(tr.iter("td"))
+        if len(tds) < MIN_CELLS:
+            continue
+        titled = tds[1].xpath(".//a[@title]")
+        mod_name = titled[0].get("title") if titled else None
+        cell_texts = ["".join(_collapse_whitespace(text) for text in td.itertext()) for td in tds]
+        row = _make_row(cell_texts, mod_name)
+        if row:
+            rows.append(row)
+    return rows
+
+
+def parse_uploader_rows(html):
+    """
+    ページHTMLからuploaderTableの行データを抽出する。
+    戻り値: [{'file_id', 'mod_id', 'mod_name', 'mod_update_text', 'jp_upload_date', 'size'}, ...]
+    テーブル（またはtbody）が無い場合・有効な行が無い場合は空リスト。
+    """
+    if not html:
+        return []
+    if HAS_LXML and _is_well_formed_table(html):
+        return _parse_with_lxml(html)
+    return _parse_with_html_parser(html)
+
+
+def _parse_with_bs4(html):
+    """従来のBeautifulSoup(html.parser)による抽出（ベンチマークの比較用）"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table', class_=TABLE_CLASS)
+    if not table or not table.tbody:
+        return []
+    rows = []
+    for tr in table.tbody.find_all('tr'):
+        cells = tr.find_all('td')
+        if len(cells) < MIN_CELLS:
+            continue
+        titled = cells[1].find('a', title=True)
+        row = _make_row([c.text for c in cells], titled['title'] if titled else None)
+        if row:
+            rows.append(row)
+    return rows
+
+
+if __name__ == '__main__':
+    # ベンチマーク: 保存済みのページHTMLで従来のBeautifulSoupによる抽出と出力を比べ、速度を測る
+    #   python uploader_parser.py                         # fixtures/ の保存済みページ
+    #   python uploader_parser.py page0.html page1.html   # 任意のページ
+    # 出力が一致しなければ終了コード1
+    import sys
+    import glob
+    import time
+
+    def _bench(func, pages, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for page in pages:
+                func(page)
+        return (time.perf_counter() - start) / (repeat * len(pages))
+
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(FIXTURES_DIR, "uploader_*.html")))
+    if not paths:
+        print("使い方: python uploader_parser.py <保存したページHTML> ...")
+        sys.exit(1)
+
+    pages = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages.append(f.read())
+
+    implementations = [("html.parser (HTMLParser)", _parse_with_html_parser)]
+    if HAS_LXML:
+        # タグが対応していないページはhtml.parserでの解析に切り替わる
+        implementations.append(("lxml（崩れたページはhtml.parser）", parse_uploader_rows))
+
+    mismatch = False
+    for path, page in zip(paths, pages):
+        expected = _parse_with_bs4(page)
+        for name, func in implementations:
+            if func(page) != expected:
+                mismatch = True
+                print(f"不一致: {path} ({name})")
+    print("出力一致: " + ("NG" if mismatch else "OK"))
+
+    repeat = 20
+    baseline = _bench(_parse_with_bs4, pages, repeat)
+    print(f"BeautifulSoup(html.parser): {baseline * 1000:.2f} ms/ページ")
+    for name, func in implementations:
+        elapsed = _bench(func, pages, repeat)
+        print(f"{name}: {elapsed * 1000:.2f} ms/ページ ({baseline / elapsed:.1f}倍)")
+    sys.exit(1 if mismatch else 0)
@@ -1,12 +1,13 @@
 import os
 import re
 import stat
+import errno
+import shutil
 import io
 import xml.etree.ElementTree as ET
-import requests
-from PIL import Image, ImageTk
+from contextlib import contextmanager
 
-from config import JP_DIR_NAME
+from config import JP_DIR_NAME, PLACEMENT_FANOUT_MODE
 
 def sanitize_filename(name):
     """ファイル名やディレクトリ名として使えない文字を置換する"""
@@ -17,18 +18,43 @@ def sanitize_filename(name):
 
 def get_mod_name_from_xml(mod_path):
     """MODのAbout/About.xmlから<name>タグの内容を読み取る"""
+    return read_mod_metadata(mod_path)['name']
+
+def read_mod_metadata(mod_path):
+    """
+    MODのAbout/About.xmlからname, packageId, supportedVersionsを読み取る。
+    iterparseで先頭から読み、必要な項目が揃った時点で解析を打ち切る
+    （長いdescriptionや依存関係リストは読み飛ばさずに済む範囲で終了）。
+    戻り値: {'name': str|None, 'package_id': str|None, 'supported_versions': [str]}
+    """
+    metadata = {'name': None, 'package_id': None, 'supported_versions': []}
     about_xml_path = os.path.join(mod_path, "About", "About.xml")
+    # ルート直下のタグ → metadataのキー
+    wanted = {'name': 'name', 'packageId': 'package_id', 'supportedVersions': 'supported_versions'}
+    found = set()
     try:
-        if os.path.exists(about_xml_path):
-            tree = ET.parse(about_xml_path)
-            root = tree.getroot()
-            name_tag = root.find('name')
-            if name_tag is not None and name_tag.text:
-                return name_tag.text.strip()
-    except (ET.ParseError, FileNotFoundError):
-        # XMLの解析エラーやファイルが見つからない場合はNoneを返す
+        depth = 0
+        for event, elem in ET.iterparse(about_xml_path, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1 and elem.tag in wanted:
+                key = wanted[elem.tag]
+                if key == 'supported_versions':
+                    metadata[key] = [li.text.strip() for li in elem if li.text and li.text.strip()]
+                elif elem.text and elem.text.strip():
+                    metadata[key] = elem.text.strip()
+                found.add(elem.tag)
+                if len(found) == len(wanted):
+                    break
+            if depth == 1:
+                # 不要になったルート直下の要素は解放する
+                elem.clear()
+    except (ET.ParseError, OSError):
+        # XMLの解析エラーやファイルが見つからない場合はそこまでの結果を返す
         pass
-    return None
+    return metadata
 
 def extract_mod_id(url):
     """URLからMODのIDを抽出する（Steamとrimworld.2game.infoの両対応）"""
@@ -51,26 +77,78 @@ def force_remove(func, path, exc_info):
     os.chmod(path, stat.S_IWRITE)
     func(path)
 
+def remove_quietly(path):
+    """ファイルを削除する（存在しない・削除できない場合は何もしない）。戻り値: 削除できた場合True"""
+    try:
+        os.remove(path)
+    except OSError:
+        return False
+    return True
+
+@contextmanager
+def atomic_open(path, mode='w', **kwargs):
+    """
+    path + ".tmp" に書き込み、書き終えたらos.replaceでpathと置き換える。
+    書き込み途中で失敗しても既存のpathは壊れない。
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, mode, **kwargs) as f:
+        yield f
+    os.replace(tmp_path, path)
+
+def evict_lru(cache_dir, suffix, max_bytes, remove, keep=None):
+    """
+    cache_dir内のsuffixで終わるファイルの合計サイズがmax_bytesを超えていれば、
+    最終利用（更新日時）の古い順にremove(path)で削除する。keepは削除しない。
+    removeは削除できなかった場合にFalseを返す（そのファイルは次回に回す）。
+    """
+    entries = []
+    total = 0
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(suffix):
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+    if total <= max_bytes:
+        return
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if path == keep or remove(path) is False:
+            continue
+        total -= size
+
+JAPANESE_DIR_VARIANTS = [
+    JP_DIR_NAME,  # "Japanese"
+    "Japanese (日本語)",
+    "Japanese(日本語)",
+    "Japanese_日本語",
+    "Japanese-日本語"
+]
+
+def japanese_dir_match_rank(dirname):
+    """
+    フォルダ名がJapaneseフォルダとしてどの程度確からしいかを返す（小さいほど優先）。
+    0: 完全一致, 1: 大文字小文字を無視して一致, 2: "Japanese"で始まる, None: 該当しない
+    """
+    # 完全一致チェック
+    if dirname in JAPANESE_DIR_VARIANTS:
+        return 0
+    # 大文字小文字を無視したチェック
+    if any(variant.lower() == dirname.lower() for variant in JAPANESE_DIR_VARIANTS):
+        return 1
+    # "Japanese"で始まるフォルダもチェック
+    if dirname.lower().startswith("japanese"):
+        return 2
+    return None
+
 def find_japanese_dir(root):
     """指定されたフォルダ内で'Japanese'または'Japanese (日本語)'という名前のフォルダを探す"""
-    japanese_variants = [
-        JP_DIR_NAME,  # "Japanese"
-        "Japanese (日本語)",
-        "Japanese(日本語)",
-        "Japanese_日本語",
-        "Japanese-日本語"
-    ]
-    
     for dirpath, dirnames, _ in os.walk(root):
         for dirname in dirnames:
-            # 完全一致チェック
-            if dirname in japanese_variants:
-                return os.path.join(dirpath, dirname)
-            # 大文字小文字を無視したチェック
-            if any(variant.lower() == dirname.lower() for variant in japanese_variants):
-                return os.path.join(dirpath, dirname)
-            # "Japanese"で始まるフォルダもチェック
-            if dirname.lower().startswith("japanese"):
+            if japanese_dir_match_rank(dirname) is not None:
                 return os.path.join(dirpath, dirname)
     return None
 
@@ -165,12 +243,85 @@ def determine_placement_locations(mod_path):
     
     return placement_locations
 
-def copy_japanese_to_locations(jp_dir, placement_locations, logger=None):
+try:
+    import fcntl
+    # LinuxのFICLONE ioctl（Btrfs / XFSなどでリフリンクを作成）
+    _FICLONE = 0x40049409
+except ImportError:
+    fcntl = None
+
+# リンクできない場合に出るエラー（別デバイス・非対応のファイルシステムなど）
+LINK_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.EPERM, errno.EACCES, errno.EINVAL, errno.ENOTTY,
+    errno.EOPNOTSUPP, getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP), errno.EMLINK,
+}
+
+# 戦略の優先順（後ろほど弱い＝ディスクを多く使う）
+FANOUT_STRATEGIES = ("reflink", "hardlink", "copy")
+
+
+def _reflink_file(src, dst):
+    """srcのリフリンク（Copy-on-Writeの複製）をdstに作る。非対応ならOSError"""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink is not supported on this platform")
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            os.remove(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+class _FanoutCopier:
     """
-    Japaneseフォルダを複数の配置場所にコピーする
+    shutil.copytreeのcopy_functionとして使い、リフリンク→ハードリンク→コピーの順に試す。
+    1度失敗した方法は同じ配置場所の残りのファイルでは試さない。
+    """
+
+    def __init__(self):
+        self._available = list(FANOUT_STRATEGIES)
+        self.used = set()
+
+    def __call__(self, src, dst):
+        for strategy in list(self._available):
+            if strategy == "copy":
+                shutil.copy2(src, dst)
+            else:
+                try:
+                    if strategy == "reflink":
+                        _reflink_file(src, dst)
+                    else:
+                        os.link(src, dst)
+                except OSError as e:
+                    if e.errno not in LINK_UNSUPPORTED_ERRNOS:
+                        raise
+                    self._available.remove(strategy)
+                    continue
+            self.used.add(strategy)
+            return dst
+
+    @property
+    def strategy(self):
+        """実際に使った中で最も弱い方法（ファイルが無ければ先頭の候補）"""
+        for strategy in reversed(FANOUT_STRATEGIES):
+            if strategy in self.used:
+                return strategy
+        return self._available[0]
+
+
+def copy_japanese_to_locations(jp_dir, placement_locations, logger=None, mode=PLACEMENT_FANOUT_MODE):
+    """
+    Japaneseフォルダを複数の配置場所にコピーする。
+    mode="link"の場合は1箇所目だけ実際にコピーし、2箇所目以降はそのコピーから
+    リフリンク/ハードリンクで作る（別ドライブなどリンクできない場合はコピーに切り替える）。
+    戻り値: (成功数, 配置場所の数, 使った方法の一覧 ["copy", "hardlink", ...])
     """
     success_count = 0
     total_count = len(placement_locations)
+    strategies = []
+    link_source = None  # 2箇所目以降のリンク元（1箇所目に配置したJapaneseフォルダ）
     
     for i, dest_languages_dir in enumerate(placement_locations):
         try:
@@ -184,11 +335,19 @@ def copy_japanese_to_locations(jp_dir, placement_locations, logger=None):
             if os.path.exists(dest_jp_dir):
                 shutil.rmtree(dest_jp_dir, onerror=force_remove)
             
-            # Japaneseフォルダをコピー
-            shutil.copytree(jp_dir, dest_jp_dir)
+            # Japaneseフォルダをコピー（2箇所目以降はリンクを優先）
+            if mode == "link" and link_source:
+                copier = _FanoutCopier()
+                shutil.copytree(link_source, dest_jp_dir, copy_function=copier)
+                strategy = copier.strategy
+            else:
+                shutil.copytree(jp_dir, dest_jp_dir)
+                strategy = "copy"
+                link_source = dest_jp_dir
+            strategies.append(strategy)
             
             if logger:
-                logger.info(f"      -> 配置完了 ({i+1}/{total_count}): {dest_jp_dir}")
+                logger.info(f"      -> 配置完了 ({i+1}/{total_count}, {strategy}): {dest_jp_dir}")
             
             success_count += 1
             
@@ -196,7 +355,7 @@ def copy_japanese_to_locations(jp_dir, placement_locations, logger=None):
             if logger:
                 logger.error(f"      -> 配置失敗 ({i+1}/{total_count}): {dest_languages_dir} - {e}")
     
-    return success_count, total_count
+    return success_count, total_count, strategies
 
 def open_folder(path, folder_name, pman=None):
     """指定されたパスのフォルダを開き、存在しない場合は作成する"""
@@ -216,9 +375,12 @@ def open_folder(path, folder_name, pman=None):
 
 def load_website_icon(button, icon_url="https://rimworld.2game.info/images/icon48x48.png"):
     """ウェブサイトのアイコンを読み込んでボタンに設定する"""
+    # GUI専用の重い依存はここで読み込む（CLIの起動を遅くしないため）
+    from PIL import Image, ImageTk
+    from http_client import http_get
     try:
         # アイコンをダウンロード
-        response = requests.get(icon_url, timeout=10)
+        response = http_get(icon_url, timeout=10)
         response.raise_for_status()
         
         # PILで画像を読み込み